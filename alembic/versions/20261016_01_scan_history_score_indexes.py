@@ -0,0 +1,41 @@
+"""add covering scan_history indexes for the score jobs
+
+Revision ID: 20261016_01
+Revises: 20260504_01
+Create Date: 2026-10-16 00:00:00.000000
+
+The monthly cyber card job filters scan_history by
+(user_id, scan_type, created_at) and the daily security score job by
+(user_id, created_at) grouped on risk. INCLUDE-ing the counted columns
+lets both aggregations run as index-only scans.
+"""
+
+from alembic import op
+
+revision = "20261016_01"
+down_revision = "20260504_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scan_history_user_type_created
+            ON scan_history (user_id, scan_type, created_at) INCLUDE (risk)
+            """
+        )
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scan_history_user_created_risk
+            ON scan_history (user_id, created_at) INCLUDE (risk, scan_type)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_scan_history_user_created_risk")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_scan_history_user_type_created")
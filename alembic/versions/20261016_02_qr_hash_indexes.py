@@ -0,0 +1,45 @@
+"""drop redundant qr_hash indexes and size qr_hash for sha256 hex
+
+Revision ID: 20261016_02
+Revises: 20261016_01
+Create Date: 2026-10-16 00:00:00.000000
+
+qr_reputations.qr_hash is UNIQUE, whose constraint already builds a btree,
+and qr_reports.qr_hash is the leading column of
+ix_qr_reports_qr_hash_created_at, so the standalone indexes only add write
+amplification. QR hashes are sha256 hex digests (64 chars).
+"""
+
+from alembic import op
+
+revision = "20261016_02"
+down_revision = "20261016_01"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("qr_reputations", "qr_scan_logs", "qr_reports")
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_qr_reputations_qr_hash")
+    op.execute("DROP INDEX IF EXISTS ix_qr_reports_qr_hash")
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE IF EXISTS {table} ALTER COLUMN qr_hash TYPE VARCHAR(64)")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE IF EXISTS {table} ALTER COLUMN qr_hash TYPE VARCHAR(256)")
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF to_regclass('qr_reports') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS ix_qr_reports_qr_hash ON qr_reports (qr_hash);
+            END IF;
+            IF to_regclass('qr_reputations') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS ix_qr_reputations_qr_hash ON qr_reputations (qr_hash);
+            END IF;
+        END $$;
+        """
+    )
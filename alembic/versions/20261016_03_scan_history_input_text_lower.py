@@ -0,0 +1,84 @@
+"""add lower(input_text) column to scan_history
+
+Revision ID: 20261016_03
+Revises: 20261016_02
+Create Date: 2026-10-16 00:00:00.000000
+
+/risk/insights counts ten suspicious keywords per row, and each FILTER
+clause lowercased input_text again. input_text_lower holds the value
+computed once at write time, so the keyword aggregate is plain strpos calls.
+
+scan_history is the busiest write table, so this avoids a GENERATED ...
+STORED column (a full table rewrite under ACCESS EXCLUSIVE). The column is
+added nullable (catalog-only), a trigger fills it for new writes, and
+existing rows are backfilled in short primary-key batches outside the
+migration transaction. Readers coalesce to lower(input_text) until the
+backfill finishes.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261016_03"
+down_revision = "20261016_02"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE scan_history ADD COLUMN IF NOT EXISTS input_text_lower TEXT")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION scan_history_set_input_text_lower()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.input_text_lower := lower(NEW.input_text);
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_scan_history_input_text_lower ON scan_history")
+    op.execute(
+        """
+        CREATE TRIGGER trg_scan_history_input_text_lower
+        BEFORE INSERT OR UPDATE OF input_text ON scan_history
+        FOR EACH ROW EXECUTE FUNCTION scan_history_set_input_text_lower()
+        """
+    )
+
+    # Each batch commits on its own so row locks are held only briefly.
+    with op.get_context().autocommit_block():
+        _backfill_input_text_lower(op.get_bind())
+
+
+def _backfill_input_text_lower(bind) -> None:
+    next_ids = sa.text(
+        "SELECT id FROM scan_history WHERE id > CAST(:after AS uuid) "
+        "ORDER BY id LIMIT :limit"
+    )
+    fill = sa.text(
+        """
+        UPDATE scan_history
+        SET input_text_lower = lower(input_text)
+        WHERE id >= CAST(:first AS uuid) AND id <= CAST(:last AS uuid)
+          AND input_text_lower IS NULL
+          AND input_text IS NOT NULL
+        """
+    )
+
+    after = "00000000-0000-0000-0000-000000000000"
+    while True:
+        ids = bind.execute(next_ids, {"after": after, "limit": BACKFILL_BATCH_SIZE}).scalars().all()
+        if not ids:
+            return
+        bind.execute(fill, {"first": str(ids[0]), "last": str(ids[-1])})
+        after = str(ids[-1])
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_scan_history_input_text_lower ON scan_history")
+    op.execute("DROP FUNCTION IF EXISTS scan_history_set_input_text_lower()")
+    op.execute("ALTER TABLE scan_history DROP COLUMN IF EXISTS input_text_lower")
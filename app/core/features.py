@@ -13,6 +13,7 @@ from __future__ import annotations
 # =============================================================================
 
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 
@@ -106,6 +107,14 @@ PLAN_FEATURES: dict[str, set[Feature]] = {
     TIER_ULTRA: GO_ULTRA_FEATURES,
 }
 
+# Frozen lookup tables built once at import; has_feature() runs on every
+# feature-gated request and should not re-derive them.
+PLAN_FEATURE_TABLE: dict[str, frozenset[Feature]] = {
+    plan: frozenset(features) for plan, features in PLAN_FEATURES.items()
+}
+_EMPTY_FEATURES: frozenset[Feature] = frozenset()
+_FEATURE_BY_VALUE: dict[str, Feature] = {f.value: f for f in Feature}
+
 # ── Per-plan limits ────────────────────────────────────────────────────────
 # None = unlimited; 0 = explicitly blocked (enforced at feature layer)
 
@@ -156,9 +165,14 @@ GLOBAL_LIMITS: dict[Limit, int] = {
 
 # ── Helper functions ────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=128)
 def normalize_plan(raw_plan: str | None) -> str:
     if not raw_plan:
         return TIER_FREE
+    # Canonical tiers and exact aliases skip the strip/upper allocation.
+    canonical = PLAN_ALIASES.get(raw_plan)
+    if canonical is not None:
+        return canonical
     normalized = str(raw_plan).strip().upper()
     return PLAN_ALIASES.get(normalized, TIER_FREE)
 
@@ -166,13 +180,23 @@ def normalize_plan(raw_plan: str | None) -> str:
 def _feature_value(feature: Feature | str) -> Feature:
     if isinstance(feature, Feature):
         return feature
-    return Feature(feature)
+    resolved = _FEATURE_BY_VALUE.get(feature)
+    if resolved is None:
+        return Feature(feature)
+    return resolved
 
 
 def has_feature(user: Any, feature: Feature | str) -> bool:
     plan = normalize_plan(getattr(user, "plan", None))
     required = _feature_value(feature)
-    return required in PLAN_FEATURES.get(plan, set())
+    return required in PLAN_FEATURE_TABLE.get(plan, _EMPTY_FEATURES)
+
+
+def _limit_value(limit: Limit | str) -> Limit:
+    # Limit is a str-Enum, so check for members first to avoid re-coercing.
+    if isinstance(limit, Limit):
+        return limit
+    return Limit(limit)
 
 
 def get_plan_limit(user_or_plan: Any, limit: Limit | str) -> int | None:
@@ -180,14 +204,12 @@ def get_plan_limit(user_or_plan: Any, limit: Limit | str) -> int | None:
         plan = normalize_plan(user_or_plan)
     else:
         plan = normalize_plan(getattr(user_or_plan, "plan", None))
-    resolved = Limit(limit) if isinstance(limit, str) else limit
-    limits = PLAN_LIMITS.get(plan, PLAN_LIMITS[TIER_FREE])
-    return limits.get(resolved)
+    limits = PLAN_LIMITS.get(plan) or PLAN_LIMITS[TIER_FREE]
+    return limits.get(_limit_value(limit))
 
 
 def get_global_limit(limit: Limit | str) -> int:
-    resolved = Limit(limit) if isinstance(limit, str) else limit
-    return GLOBAL_LIMITS[resolved]
+    return GLOBAL_LIMITS[_limit_value(limit)]
 
 
 def get_feature_limit(user: Any, feature: Feature | str) -> int | None:
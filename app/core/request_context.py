@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+# Set by SecurityLoggingMiddleware for the lifetime of each HTTP request.
+# Tasks and threadpool calls copy the current context when they start, so
+# background work spawned by a request (BackgroundTasks, run_in_threadpool)
+# still sees the request id without it being threaded through signatures.
+REQUEST_ID: ContextVar[str] = ContextVar("request_id", default="")
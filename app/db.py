@@ -1,5 +1,6 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -9,11 +10,22 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL not set")
 
+_engine_options = {}
+if make_url(DATABASE_URL).get_driver_name() == "psycopg2":
+    # Send executemany() batches (job upserts) as paged statements
+    # rather than one round trip per parameter set.
+    _engine_options["executemany_mode"] = "values_plus_batch"
+
+# Sync routes run on Starlette's threadpool (40 threads by default), so the
+# pool is sized per deployment rather than fixed at 5 + 10 connections.
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    pool_timeout=float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600")),
+    **_engine_options,
 )
 
 SessionLocal = sessionmaker(
@@ -1,26 +1,41 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import Any
 
 from fastapi import Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.exc import UnmappedInstanceError
 
 from app.core.features import Feature, has_feature, normalize_plan
-from app.db import get_db
 from app.routes.auth import get_current_user
 from app.services.upgrade import build_upgrade_response
 
 logger = logging.getLogger(__name__)
 
 
+def _user_session(user: Any) -> Session | None:
+    # get_current_user loads the user through the request's get_db session;
+    # reuse it for the deny-path audit log instead of depending on get_db.
+    try:
+        return object_session(user)
+    except UnmappedInstanceError:
+        return None
+
+
+@lru_cache(maxsize=None)
 def require_feature(feature: Feature | str, detail: Any = None):
+    """Return the (shared) dependency gating a route on *feature*.
+
+    Cached per (feature, detail) so every route guarded by the same feature
+    reuses one callable; ``detail`` must therefore be hashable.
+    """
     feature_name = feature.value if isinstance(feature, Feature) else str(feature)
 
     def _dependency(
         request: Request,
         current_user=Depends(get_current_user),
-        db: Session = Depends(get_db),
     ):
         if not has_feature(current_user, feature):
             logger.warning(
@@ -35,7 +50,7 @@ def require_feature(feature: Feature | str, detail: Any = None):
                 user=current_user,
                 reason="feature_not_in_plan",
                 feature=feature_name,
-                db=db,
+                db=_user_session(current_user),
                 endpoint=request.url.path,
             )
             if detail is not None:
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from fastapi import Depends, Query, Request
 
 from app.models.user import User
 from app.routes.auth import get_current_user_optional
-from app.services.language import ALLOWED_LANGUAGES, resolve_language_value
+from app.services.language import ALLOWED_LANGUAGES, parse_accept_language, resolve_language_value
+
+
+@lru_cache(maxsize=256)
+def _accept_language_choice(header_value: str) -> str | None:
+    return parse_accept_language(header_value, supported=ALLOWED_LANGUAGES)
 
 
 def resolve_language(
@@ -12,6 +19,14 @@ def resolve_language(
     lang: str | None = Query(None),
     current_user: User | None = Depends(get_current_user_optional),
 ) -> str:
+    # Fast path: no ?lang= and no stored preference leaves only the header,
+    # whose parse is deterministic and drawn from a small set of values.
+    if lang is None and not getattr(current_user, "preferred_language", None):
+        header_value = request.headers.get("accept-language")
+        if not header_value:
+            return "en"
+        return _accept_language_choice(header_value) or "en"
+
     return resolve_language_value(
         query_lang=lang,
         user=current_user,
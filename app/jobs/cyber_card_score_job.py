@@ -10,24 +10,35 @@ Eligible users are scored via the shared calculate_cyber_score() engine
 so that batch scores are always consistent with real-time scores.
 """
 import json
-import uuid
 import logging
 
 from sqlalchemy import text
 
-from app.db import SessionLocal
+from app.core.ids import uuid7
+from app.db import SessionLocal, engine
 from app.services.cyber_card_constants import get_risk_level
 from app.services.cyber_card_scorer import calculate_cyber_score
 
 logger = logging.getLogger(__name__)
 
 
+BATCH_SIZE = 500
+
+# One shared compact encoder for the jsonb columns; Postgres normalises
+# whitespace on storage, so the separators only shrink the wire payload.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+# Locked placeholders all carry the same signals payload; serialise it once.
+_LOCKED_SIGNALS_JSON = _encode_json({
+    "eligibility": "LOCKED_THIS_MONTH",
+    "lock_reason": "Mandatory Email/Password scan missed (days 1–5)",
+})
+
+
 def run_cyber_card_score_job() -> None:
     db = SessionLocal()
 
     try:
-        users = db.execute(text("SELECT id FROM users")).mappings().all()
-
         month_start = db.execute(
             text(
                 "SELECT date_trunc('month', now() AT TIME ZONE 'Asia/Kolkata')"
@@ -39,18 +50,42 @@ def run_cyber_card_score_job() -> None:
 
         processed = locked = errors = 0
 
-        for user in users:
-            uid = str(user["id"])
-            try:
-                _process_user(db, uid, month_start, eligibility_window_end)
-                processed += 1
-            except Exception:
-                logger.exception(
-                    "cyber_card_job_user_failed", extra={"user_id": uid}
+        # The eligibility aggregation is streamed through a server-side cursor
+        # on its own connection so batches can be committed on ``db`` without
+        # closing the cursor or materialising every user in memory.
+        with engine.connect() as stream_conn:
+            stream_conn.execute(text("SET LOCAL work_mem = '64MB'"))
+
+            # ── Eligibility check: email + password scan in first 5 days ─────
+            # One job-wide aggregation instead of a COUNT query per user.
+            result = stream_conn.execution_options(stream_results=True).execute(
+                text(
+                    """
+                    SELECT
+                        u.id AS user_id,
+                        COUNT(*) FILTER (WHERE s.scan_type = 'EMAIL')    AS email_done,
+                        COUNT(*) FILTER (WHERE s.scan_type = 'PASSWORD') AS password_done
+                    FROM users u
+                    LEFT JOIN scan_history s
+                      ON s.user_id = u.id
+                     AND s.scan_type IN ('EMAIL', 'PASSWORD')
+                     AND s.created_at >= :start
+                     AND s.created_at < :end
+                    GROUP BY u.id
+                    """
+                ),
+                {"start": month_start, "end": eligibility_window_end},
+            )
+
+            for batch in result.mappings().partitions(BATCH_SIZE):
+                batch_processed, batch_locked, batch_errors = _process_batch(
+                    db, batch, month_start
                 )
-                errors += 1
+                db.commit()
+                processed += batch_processed
+                locked += batch_locked
+                errors += batch_errors
 
-        db.commit()
         logger.info(
             "cyber_card_job_complete",
             extra={"processed": processed, "locked": locked, "errors": errors},
@@ -63,45 +98,57 @@ def run_cyber_card_score_job() -> None:
         db.close()
 
 
-def _process_user(db, uid: str, month_start, eligibility_window_end) -> None:
-    """Score (or lock) a single user for the current month."""
+def _process_batch(db, users, month_start) -> tuple[int, int, int]:
+    """Score or lock one batch of users; returns (processed, locked, errors)."""
+    processed = errors = 0
+    locked_uids: list[str] = []
+    scored_rows: list[dict] = []
+
+    for user in users:
+        uid = str(user["user_id"])
+        if not user["email_done"] or not user["password_done"]:
+            # User missed the mandatory scan window — locked placeholder
+            locked_uids.append(uid)
+            continue
+        try:
+            scored_rows.append(_score_user(db, uid, month_start))
+            processed += 1
+        except Exception:
+            logger.exception(
+                "cyber_card_job_user_failed", extra={"user_id": uid}
+            )
+            errors += 1
 
-    # ── Eligibility check: email + password scan in first 5 days ─────────────
-    email_done = db.execute(
-        text(
-            """
-            SELECT COUNT(*) FROM scan_history
-            WHERE user_id = CAST(:uid AS uuid)
-              AND scan_type = 'EMAIL'
-              AND created_at >= :start
-              AND created_at < :end
-            """
-        ),
-        {"uid": uid, "start": month_start, "end": eligibility_window_end},
-    ).scalar() or 0
+    if scored_rows:
+        _upsert_scored(db, scored_rows)
+    if locked_uids:
+        _upsert_locked(db, locked_uids, month_start)
 
-    password_done = db.execute(
-        text(
-            """
-            SELECT COUNT(*) FROM scan_history
-            WHERE user_id = CAST(:uid AS uuid)
-              AND scan_type = 'PASSWORD'
-              AND created_at >= :start
-              AND created_at < :end
-            """
-        ),
-        {"uid": uid, "start": month_start, "end": eligibility_window_end},
-    ).scalar() or 0
+    return processed, len(locked_uids), errors
 
-    if email_done == 0 or password_done == 0:
-        # User missed the mandatory scan window — insert a locked placeholder
-        _upsert_locked(db, uid, month_start)
-        return
 
-    # ── Eligible user — compute real-time score ───────────────────────────────
+def _score_user(db, uid: str, month_start) -> dict:
+    """Score a single eligible user and return the row to upsert."""
     result = calculate_cyber_score(db, uid)
     score  = result["score"]
+    logger.info(
+        "cyber_card_job_scored",
+        extra={"user_id": uid, "score": score, "level": result["level"]},
+    )
+    return {
+        "id":         str(uuid7()),
+        "uid":        uid,
+        "score":      score,
+        "risk_level": get_risk_level(score),
+        "factors":    _encode_json(result["factors"]),
+        "insights":   _encode_json(result["insights"]),
+        "actions":    _encode_json(result["actions"]),
+        "month":      month_start,
+    }
 
+
+def _upsert_scored(db, rows: list[dict]) -> None:
+    """Write every scored row in one executemany round."""
     db.execute(
         text(
             """
@@ -127,29 +174,12 @@ def _process_user(db, uid: str, month_start, eligibility_window_end) -> None:
                 updated_at = now()
             """
         ),
-        {
-            "id":         str(uuid.uuid4()),
-            "uid":        uid,
-            "score":      score,
-            "risk_level": get_risk_level(score),
-            "factors":    json.dumps(result["factors"]),
-            "insights":   json.dumps(result["insights"]),
-            "actions":    json.dumps(result["actions"]),
-            "month":      month_start,
-        },
-    )
-    logger.info(
-        "cyber_card_job_scored",
-        extra={"user_id": uid, "score": score, "level": result["level"]},
+        rows,
     )
 
 
-def _upsert_locked(db, uid: str, month_start) -> None:
-    """Insert a LOCKED placeholder so the card shows a locked state."""
-    signals = {
-        "eligibility": "LOCKED_THIS_MONTH",
-        "lock_reason": "Mandatory Email/Password scan missed (days 1–5)",
-    }
+def _upsert_locked(db, uids: list[str], month_start) -> None:
+    """Insert LOCKED placeholders so the cards show a locked state."""
     db.execute(
         text(
             """
@@ -168,11 +198,14 @@ def _upsert_locked(db, uid: str, month_start) -> None:
                 updated_at = now()
             """
         ),
-        {
-            "id":      str(uuid.uuid4()),
-            "uid":     uid,
-            "signals": json.dumps(signals),
-            "month":   month_start,
-        },
+        [
+            {
+                "id":      str(uuid7()),
+                "uid":     uid,
+                "signals": _LOCKED_SIGNALS_JSON,
+                "month":   month_start,
+            }
+            for uid in uids
+        ],
     )
-    logger.info("cyber_card_job_locked", extra={"user_id": uid})
+    logger.info("cyber_card_job_locked", extra={"count": len(uids)})
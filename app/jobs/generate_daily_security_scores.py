@@ -1,93 +1,122 @@
 from datetime import date, timedelta
+
+import numpy as np
 from sqlalchemy import text
-from app.db import SessionLocal
+from app.db import SessionLocal, engine
 
 LOOKBACK_DAYS = 30
+BATCH_SIZE = 500
 
-def calculate_score(rows):
-    score = 100
-    high = medium = low = 0
+# Ascending score breakpoints; searchsorted(score, "right") indexes into LEVELS.
+LEVEL_BREAKPOINTS = np.array([50, 80])
+LEVELS = np.array(["high", "medium", "low"])
 
-    for r in rows:
-        if r["risk"] == "high":
-            high += r["count"]
-        elif r["risk"] == "medium":
-            medium += r["count"]
-        elif r["risk"] == "low":
-            low += r["count"]
+# Re-running the job on the same day only rewrites rows whose counts moved;
+# unchanged rows are skipped by the WHERE, so they take no new tuple or WAL.
+UPSERT_SQL = text("""
+    INSERT INTO daily_security_scores (
+        user_id, score, level,
+        high_risk, medium_risk, low_risk,
+        total_scans, score_date
+    )
+    VALUES (
+        :uid, :score, :level,
+        :high, :medium, :low,
+        :total, :date
+    )
+    ON CONFLICT (user_id, score_date)
+    DO UPDATE SET
+        score = EXCLUDED.score,
+        level = EXCLUDED.level,
+        high_risk = EXCLUDED.high_risk,
+        medium_risk = EXCLUDED.medium_risk,
+        low_risk = EXCLUDED.low_risk,
+        total_scans = EXCLUDED.total_scans
+    WHERE (
+        daily_security_scores.score,
+        daily_security_scores.level,
+        daily_security_scores.high_risk,
+        daily_security_scores.medium_risk,
+        daily_security_scores.low_risk,
+        daily_security_scores.total_scans
+    ) IS DISTINCT FROM (
+        EXCLUDED.score,
+        EXCLUDED.level,
+        EXCLUDED.high_risk,
+        EXCLUDED.medium_risk,
+        EXCLUDED.low_risk,
+        EXCLUDED.total_scans
+    )
+""")
 
-    score -= high * 15
-    score -= medium * 8
 
-    total = high + medium + low
-    if total == 0:
-        score -= 30
+def calculate_scores(high, medium, low):
+    """Score a whole batch at once; inputs are equal-length count arrays."""
+    high = np.asarray(high, dtype=np.int64)
+    medium = np.asarray(medium, dtype=np.int64)
+    low = np.asarray(low, dtype=np.int64)
 
-    score = max(0, min(100, score))
+    total = high + medium + low
+    score = 100 - high * 15 - medium * 8 - np.where(total == 0, 30, 0)
+    score = np.clip(score, 0, 100)
 
-    if score >= 80:
-        level = "low"
-    elif score >= 50:
-        level = "medium"
-    else:
-        level = "high"
+    level = LEVELS[np.searchsorted(LEVEL_BREAKPOINTS, score, side="right")]
 
     return score, level, high, medium, low, total
 
 
+def _score_rows(users, today):
+    if not users:
+        return []
+    score, level, high, medium, low, total = calculate_scores(
+        [user["high"] or 0 for user in users],
+        [user["medium"] or 0 for user in users],
+        [user["low"] or 0 for user in users],
+    )
+    return [
+        {
+            "uid": str(user["user_id"]),
+            "score": int(score[i]),
+            "level": str(level[i]),
+            "high": int(high[i]),
+            "medium": int(medium[i]),
+            "low": int(low[i]),
+            "total": int(total[i]),
+            "date": today,
+        }
+        for i, user in enumerate(users)
+    ]
+
+
 def main():
     db = SessionLocal()
     today = date.today()
     since = today - timedelta(days=LOOKBACK_DAYS)
 
-    users = db.execute(text("SELECT id FROM users")).mappings().all()
-
-    for user in users:
-        rows = db.execute(
-            text("""
-                SELECT risk, COUNT(*) AS count
-                FROM scan_history
-                WHERE user_id = CAST(:uid AS uuid)
-                  AND created_at >= :since
-                GROUP BY risk
-            """),
-            {"uid": str(user["id"]), "since": since},
-        ).mappings().all()
-
-        score, level, high, medium, low, total = calculate_score(rows)
-
-        db.execute(
-            text("""
-                INSERT INTO daily_security_scores (
-                    user_id, score, level,
-                    high_risk, medium_risk, low_risk,
-                    total_scans, score_date
-                )
-                VALUES (
-                    :uid, :score, :level,
-                    :high, :medium, :low,
-                    :total, :date
-                )
-                ON CONFLICT (user_id, score_date)
-                DO UPDATE SET
-                    score = EXCLUDED.score,
-                    level = EXCLUDED.level,
-                    high_risk = EXCLUDED.high_risk,
-                    medium_risk = EXCLUDED.medium_risk,
-                    low_risk = EXCLUDED.low_risk,
-                    total_scans = EXCLUDED.total_scans
-            """),
-            {
-                "uid": str(user["id"]),
-                "score": score,
-                "level": level,
-                "high": high,
-                "medium": medium,
-                "low": low,
-                "total": total,
-                "date": today,
-            },
-        )
+    try:
+        # One job-wide aggregation instead of a GROUP BY query per user,
+        # streamed on its own connection so each batch can be committed
+        # without closing the server-side cursor.
+        with engine.connect() as stream_conn:
+            stream_conn.execute(text("SET LOCAL work_mem = '64MB'"))
+            result = stream_conn.execution_options(stream_results=True).execute(
+                text("""
+                    SELECT
+                        u.id AS user_id,
+                        COUNT(*) FILTER (WHERE s.risk = 'high')   AS high,
+                        COUNT(*) FILTER (WHERE s.risk = 'medium') AS medium,
+                        COUNT(*) FILTER (WHERE s.risk = 'low')    AS low
+                    FROM users u
+                    LEFT JOIN scan_history s
+                      ON s.user_id = u.id
+                     AND s.created_at >= :since
+                    GROUP BY u.id
+                """),
+                {"since": since},
+            )
 
-    db.commit()
-    db.close()
+            for batch in result.mappings().partitions(BATCH_SIZE):
+                db.execute(UPSERT_SQL, _score_rows(batch, today))
+                db.commit()
+    finally:
+        db.close()
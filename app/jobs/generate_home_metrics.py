@@ -6,6 +6,7 @@ Background job to generate Home intelligence:
 
 import os
 import json
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
@@ -13,8 +14,9 @@ from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 from pathlib import Path
 
-from supabase import create_client
-from openai import OpenAI
+from app.services.llm_cache import get_cached_completion, set_cached_completion
+from app.services.openai_client import JOB_MAX_RETRIES, close_async_openai, get_async_openai
+from app.services.supabase_client import get_supabase
 
 
 # ------------------------
@@ -39,9 +41,9 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
 if not OPENAI_API_KEY:
     raise RuntimeError("OpenAI API key missing")
 
-# ✅ SINGLE, CORRECT SUPABASE CLIENT (SERVICE ROLE)
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-openai = OpenAI(api_key=OPENAI_API_KEY)
+# ✅ SINGLE, CORRECT SUPABASE CLIENT (SERVICE ROLE), shared process-wide
+# (the async OpenAI client is fetched per call: it is closed after each run)
+supabase = get_supabase()
 
 
 # ------------------------
@@ -64,31 +66,60 @@ THREAT_VALIDITY = {
 
 FINANCIAL_VALIDITY = timedelta(days=30)
 
+# Upper bound on in-flight OpenAI requests during the fan-out
+MAX_CONCURRENT_AI_CALLS = 10
+
+# A cached answer is re-inserted with a fresh valid_until, so the cache only
+# covers the first part of a metric's window; a stored metric then outlives
+# its generation by at most 1.25 windows instead of nearly two.
+AI_CACHE_WINDOW_FRACTION = 0.25
+
 
 # ------------------------
 # AI HELPERS
 # ------------------------
 
-def call_ai(prompt: str) -> Optional[Dict[str, Any]]:
-    try:
-        resp = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a cybersecurity intelligence analyst. "
-                        "Be conservative, factual, and avoid exaggeration. "
-                        "If data is insufficient, say so explicitly. "
-                        "Output STRICT JSON only."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-        )
+SYSTEM_PROMPT = (
+    "You are a cybersecurity intelligence analyst. "
+    "Be conservative, factual, and avoid exaggeration. "
+    "If data is insufficient, say so explicitly. "
+    "Output STRICT JSON only."
+)
 
-        return json.loads(resp.choices[0].message.content)
+
+async def call_ai(
+    prompt: str,
+    limiter: asyncio.Semaphore,
+    cache_ttl: timedelta,
+) -> Optional[Dict[str, Any]]:
+    body = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,
+    }
+
+    try:
+        # The prompts are static, so a run shortly after the previous one
+        # can reuse its answer (see AI_CACHE_WINDOW_FRACTION).
+        content = get_cached_completion(body)
+        if content is None:
+            async with limiter:
+                resp = await get_async_openai().with_options(
+                    max_retries=JOB_MAX_RETRIES,
+                ).chat.completions.create(**body)
+            content = resp.choices[0].message.content
+            payload = json.loads(content)
+            set_cached_completion(
+                body,
+                content,
+                int(cache_ttl.total_seconds() * AI_CACHE_WINDOW_FRACTION),
+            )
+            return payload
+
+        return json.loads(content)
 
     except Exception as e:
         logging.error(f"AI call failed: {e}")
@@ -96,41 +127,53 @@ def call_ai(prompt: str) -> Optional[Dict[str, Any]]:
 
 
 # ------------------------
-# METRIC GENERATORS
+# PROMPTS (built once at import)
 # ------------------------
 
-def generate_threat_pulse(scope: str, region_code: Optional[str]) -> Optional[Dict[str, Any]]:
-    if scope == "global":
-        sources = [
-            "IBM X-Force",
-            "Verizon DBIR",
-            "Microsoft Digital Defense",
-            "ENISA",
-            "Kaspersky",
-            "WEF",
-        ]
-        context = "global"
-
-    elif scope == "india":
-        sources = [
-            "CERT-In",
-            "RBI",
-            "NPCI",
-            "UIDAI",
-            "NCRB",
-            "IBM X-Force",
-        ]
-        context = "India-wide"
+THREAT_SOURCES = {
+    "global": [
+        "IBM X-Force",
+        "Verizon DBIR",
+        "Microsoft Digital Defense",
+        "ENISA",
+        "Kaspersky",
+        "WEF",
+    ],
+    "india": [
+        "CERT-In",
+        "RBI",
+        "NPCI",
+        "UIDAI",
+        "NCRB",
+        "IBM X-Force",
+    ],
+    "region": [
+        "CERT-In",
+        "State Police Advisories",
+        "RBI Fraud Alerts",
+    ],
+}
 
-    else:
-        sources = [
-            "CERT-In",
-            "State Police Advisories",
-            "RBI Fraud Alerts",
-        ]
-        context = f"Indian state {region_code}"
-
-    prompt = f"""
+FINANCIAL_SOURCES = {
+    "global": [
+        "Cybersecurity Ventures",
+        "IBM Cost of Data Breach",
+        "Accenture",
+        "WEF",
+        "Verizon DBIR",
+    ],
+    "india": [
+        "RBI",
+        "CERT-In",
+        "NCRB",
+        "Cybersecurity Ventures",
+        "Accenture",
+    ],
+}
+
+
+def _threat_prompt(sources: List[str], context: str) -> str:
+    return f"""
 Based on authoritative cybersecurity sources: {", ".join(sources)}
 
 Generate a {context} cyber threat pulse for the last 24 hours.
@@ -150,42 +193,9 @@ JSON format:
 }}
 """
 
-    payload = call_ai(prompt)
-    if not payload:
-        return None
-
-    return {
-        "scope": scope,
-        "region_code": region_code,
-        "metric_type": "threat_pulse",
-        "payload": payload,
-        "sources": sources,
-        "confidence": "medium",
-        "valid_until": datetime.now(tz=timezone.utc) + THREAT_VALIDITY[scope],
-    }
-
 
-def generate_financial_impact(scope: str) -> Optional[Dict[str, Any]]:
-    if scope == "global":
-        sources = [
-            "Cybersecurity Ventures",
-            "IBM Cost of Data Breach",
-            "Accenture",
-            "WEF",
-            "Verizon DBIR",
-        ]
-        context = "global"
-    else:
-        sources = [
-            "RBI",
-            "CERT-In",
-            "NCRB",
-            "Cybersecurity Ventures",
-            "Accenture",
-        ]
-        context = "India"
-
-    prompt = f"""
+def _financial_prompt(sources: List[str], context: str) -> str:
+    return f"""
 Based on cybersecurity economic reports from: {", ".join(sources)}
 
 Generate a {context} financial impact summary for cybercrime.
@@ -204,7 +214,64 @@ JSON format:
 }}
 """
 
-    payload = call_ai(prompt)
+
+# Byte-identical prompts on every run (the LLM cache keys on them).
+THREAT_PROMPTS = {
+    "global": _threat_prompt(THREAT_SOURCES["global"], "global"),
+    "india": _threat_prompt(THREAT_SOURCES["india"], "India-wide"),
+    **{
+        state: _threat_prompt(THREAT_SOURCES["region"], f"Indian state {state}")
+        for state in INDIAN_STATES
+    },
+}
+
+FINANCIAL_PROMPTS = {
+    "global": _financial_prompt(FINANCIAL_SOURCES["global"], "global"),
+    "india": _financial_prompt(FINANCIAL_SOURCES["india"], "India"),
+}
+
+
+# ------------------------
+# METRIC GENERATORS
+# ------------------------
+
+async def generate_threat_pulse(
+    scope: str,
+    region_code: Optional[str],
+    limiter: asyncio.Semaphore,
+) -> Optional[Dict[str, Any]]:
+    if scope == "region":
+        sources = THREAT_SOURCES["region"]
+        prompt = THREAT_PROMPTS.get(region_code) or _threat_prompt(
+            sources, f"Indian state {region_code}"
+        )
+    else:
+        sources = THREAT_SOURCES[scope]
+        prompt = THREAT_PROMPTS[scope]
+
+    payload = await call_ai(prompt, limiter, THREAT_VALIDITY[scope])
+    if not payload:
+        return None
+
+    return {
+        "scope": scope,
+        "region_code": region_code,
+        "metric_type": "threat_pulse",
+        "payload": payload,
+        "sources": sources,
+        "confidence": "medium",
+        "valid_until": datetime.now(tz=timezone.utc) + THREAT_VALIDITY[scope],
+    }
+
+
+async def generate_financial_impact(
+    scope: str,
+    limiter: asyncio.Semaphore,
+) -> Optional[Dict[str, Any]]:
+    key = "global" if scope == "global" else "india"
+    sources = FINANCIAL_SOURCES[key]
+
+    payload = await call_ai(FINANCIAL_PROMPTS[key], limiter, FINANCIAL_VALIDITY)
     if not payload:
         return None
 
@@ -223,18 +290,24 @@ JSON format:
 # DB INSERT (UNCHANGED BEHAVIOR)
 # ------------------------
 
+def _metric_record(row: Dict[str, Any], generated_at: str) -> Dict[str, Any]:
+    return {
+        "scope": row["scope"],
+        "region_code": row["region_code"],
+        "metric_type": row["metric_type"],
+        "payload": row["payload"],
+        "sources": row["sources"],
+        "confidence": row["confidence"],
+        "generated_at": generated_at,
+        "valid_until": row["valid_until"].isoformat(),
+    }
+
+
 def insert_metric(row: Dict[str, Any]):
     try:
-        supabase.table("home_metrics").insert({
-            "scope": row["scope"],
-            "region_code": row["region_code"],
-            "metric_type": row["metric_type"],
-            "payload": row["payload"],
-            "sources": row["sources"],
-            "confidence": row["confidence"],
-            "generated_at": datetime.now(tz=timezone.utc).isoformat(),
-            "valid_until": row["valid_until"].isoformat(),
-        }).execute()
+        supabase.table("home_metrics").insert(
+            _metric_record(row, datetime.now(tz=timezone.utc).isoformat())
+        ).execute()
 
         logging.info(
             f"Inserted {row['metric_type']} | scope={row['scope']} | region={row['region_code']}"
@@ -244,30 +317,61 @@ def insert_metric(row: Dict[str, Any]):
         logging.error(f"DB insert failed: {e}")
 
 
+def insert_metrics(rows: List[Dict[str, Any]]):
+    """
+    Insert every metric in one request; if the bulk insert is rejected,
+    fall back to per-row inserts so one bad row doesn't lose the rest.
+    """
+    if not rows:
+        return
+
+    generated_at = datetime.now(tz=timezone.utc).isoformat()
+    try:
+        supabase.table("home_metrics").insert(
+            [_metric_record(row, generated_at) for row in rows]
+        ).execute()
+        logging.info(f"Inserted {len(rows)} home metrics")
+
+    except Exception as e:
+        logging.error(f"Bulk insert failed, retrying per row: {e}")
+        for row in rows:
+            insert_metric(row)
+
+
 # ------------------------
 # MAIN EXECUTION
 # ------------------------
 
-def main():
-    logging.info("🚀 Home metrics generation started")
+async def generate_all() -> List[Optional[Dict[str, Any]]]:
+    """Fan out every metric prompt concurrently (bounded by the semaphore)."""
+    limiter = asyncio.Semaphore(MAX_CONCURRENT_AI_CALLS)
 
-    for scope, region in [
-        ("global", None),
-        ("india", "IN"),
-    ]:
-        row = generate_threat_pulse(scope, region)
-        if row:
-            insert_metric(row)
+    tasks = [
+        generate_threat_pulse("global", None, limiter),
+        generate_threat_pulse("india", "IN", limiter),
+        *[generate_threat_pulse("region", state, limiter) for state in INDIAN_STATES],
+        generate_financial_impact("global", limiter),
+        generate_financial_impact("india", limiter),
+    ]
 
-    for state in INDIAN_STATES:
-        row = generate_threat_pulse("region", state)
-        if row:
-            insert_metric(row)
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await close_async_openai()
 
-    for scope in ["global", "india"]:
-        row = generate_financial_impact(scope)
-        if row:
-            insert_metric(row)
+    rows: List[Optional[Dict[str, Any]]] = []
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error(f"Metric generation failed: {result}")
+            continue
+        rows.append(result)
+    return rows
+
+
+def main():
+    logging.info("🚀 Home metrics generation started")
+
+    insert_metrics([row for row in asyncio.run(generate_all()) if row])
 
     logging.info("✅ Home metrics generation completed")
 
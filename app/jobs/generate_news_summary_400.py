@@ -6,14 +6,31 @@ Batch job: Generate ~400 character security-focused summaries (English only)
 - Handles NULL + empty summaries
 """
 
-import os
+import asyncio
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from dotenv import load_dotenv
-from openai import OpenAI
-
+from app.services.llm_cache import get_cached_completion, set_cached_completion
+from app.services.news_job_claims import (
+    attach_news_batch,
+    claim_pending_news,
+    finish_news_claims,
+    outstanding_news_batches,
+)
+from app.services.openai_batch import (
+    BATCH_CLAIM_LEASE_SECONDS,
+    batch_api_enabled,
+    fetch_batch_results,
+    submit_batch,
+)
+from app.services.openai_client import (
+    JOB_MAX_RETRIES,
+    close_async_openai,
+    get_async_openai,
+    get_openai,
+)
 from app.services.supabase_client import get_supabase
 
 # ------------------------
@@ -23,9 +40,17 @@ from app.services.supabase_client import get_supabase
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 load_dotenv(BASE_DIR / ".env")
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = get_openai().with_options(max_retries=JOB_MAX_RETRIES)
 
-BATCH_SIZE = 5
+# Rows summarized per realtime run (one concurrent request per row)
+BATCH_SIZE = 50
+# Rows pulled per run when summaries go through the Batch API
+BATCH_API_FETCH_LIMIT = 200
+# Identical summary requests (e.g. rows whose write failed last run)
+# are answered from the LLM cache for this long
+SUMMARY_CACHE_TTL_SECONDS = 24 * 3600
+# Ledger name in news_job_claims
+SUMMARY_JOB = "summary_400"
 
 supabase = get_supabase()
 
@@ -33,109 +58,195 @@ supabase = get_supabase()
 # DB HELPERS
 # ------------------------
 
-def fetch_without_summary() -> List[Dict]:
+def fetch_without_summary(limit: int = BATCH_SIZE, lease_seconds: Optional[int] = None) -> List[Dict]:
+    """
+    Claim rows where summary_400 is NULL OR empty string.
+
+    claim_pending_news selects and leases the rows in one statement
+    (FOR UPDATE SKIP LOCKED), so overlapping runs never summarize the
+    same row twice.
+    """
+    return claim_pending_news(SUMMARY_JOB, limit, lease_seconds)
+
+
+def update_summary(rows: List[Dict]) -> int:
     """
-    Fetch rows where summary_400 is NULL OR empty string
+    Write all summaries in one round trip (bulk_update_news RPC).
+    Returns the number of news rows updated.
     """
-    res = (
-        supabase
-        .table("news")
-        .select("id, headline, matter")
-        .or_("summary_400.is.null,summary_400.eq.")
-        .limit(BATCH_SIZE)
-        .execute()
-    )
-    return res.data or []
-
-
-def update_summary(rows: List[Dict]):
+    updates = []
     for row in rows:
-        summary = row.get("summary_400", "").strip()
+        summary = (row.get("summary_400") or "").strip()
         if not row.get("id") or not summary:
             continue
+        updates.append({"id": row["id"], "summary_400": summary})
 
-        supabase.table("news") \
-            .update({"summary_400": summary}) \
-            .eq("id", row["id"]) \
-            .execute()
+    if not updates:
+        return 0
+
+    res = supabase.rpc("bulk_update_news", {"p_rows": updates}).execute()
+    return int(res.data or 0)
 
 
 # ------------------------
 # AI SUMMARIZATION
 # ------------------------
 
-def summarize_batch(items: List[Dict]) -> List[Dict]:
-    if not items:
-        return []
+SUMMARY_MODEL = "gpt-4o-mini"
 
-    payload = []
-
-    for i in items:
-        text = (i.get("matter") or i.get("headline") or "").strip()
-        if not text:
-            continue
-
-        payload.append({
-            "id": i["id"],
-            "text": text
-        })
-
-    if not payload:
-        return []
+# One request per row, at most this many in flight
+MAX_CONCURRENT_AI_CALLS = 10
 
-    prompt = f"""
-You are a cybersecurity analyst.
-
-Task:
-Summarize each item into a concise security-focused summary.
+SUMMARY_SYSTEM_PROMPT = """
+You are a cybersecurity analyst. You write concise cybersecurity risk summaries.
 
 Rules:
 - Focus on risk, impact, and why it matters
 - Neutral professional tone
 - Max ~400 characters
 - No HTML, no links, no emojis
-- Output STRICT JSON ARRAY ONLY
-
-Format:
-[
-  {{
-    "id": "string",
-    "summary_400": "string"
-  }}
-]
-
-Input:
-{json.dumps(payload, ensure_ascii=False)}
+- Output STRICT JSON ONLY: {"summary_400": "string"}
 """
 
+
+def build_summary_request(item: Dict) -> Optional[Dict]:
+    """
+    Build the chat.completions request body for one row,
+    or None when the row has no text to summarize.
+    """
+    text = (item.get("matter") or item.get("headline") or "").strip()
+    if not text:
+        return None
+
+    return {
+        "model": SUMMARY_MODEL,
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": text},
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.2,
+    }
+
+
+def parse_summary_response(raw: str) -> str:
+    summary = json.loads(raw).get("summary_400")
+
+    if not isinstance(summary, str) or not summary.strip():
+        raise ValueError("No summary_400 in response")
+
+    return summary.strip()
+
+
+async def summarize_one(item: Dict, limiter: asyncio.Semaphore) -> Optional[Dict]:
+    body = build_summary_request(item)
+    if body is None:
+        return None
+
+    content = get_cached_completion(body)
+    if content is None:
+        async with limiter:
+            resp = await get_async_openai().with_options(
+                max_retries=JOB_MAX_RETRIES,
+            ).chat.completions.create(**body)
+        content = resp.choices[0].message.content
+        summary = parse_summary_response(content)
+        set_cached_completion(body, content, SUMMARY_CACHE_TTL_SECONDS)
+    else:
+        summary = parse_summary_response(content)
+
+    return {"id": item["id"], "summary_400": summary}
+
+
+async def summarize_rows(items: List[Dict]) -> List[Dict]:
+    """Summarize every row concurrently; a failed row doesn't sink the rest."""
+    limiter = asyncio.Semaphore(MAX_CONCURRENT_AI_CALLS)
+
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You write concise cybersecurity risk summaries."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
+        results = await asyncio.gather(
+            *[summarize_one(item, limiter) for item in items],
+            return_exceptions=True,
         )
+    finally:
+        await close_async_openai()
 
-        raw = resp.choices[0].message.content.strip()
+    summarized = []
+    for item, result in zip(items, results):
+        if isinstance(result, Exception):
+            print(f"❌ Summary generation failed for {item.get('id')}: {result}")
+            continue
+        if result:
+            summarized.append(result)
+    return summarized
 
-        start = raw.find("[")
-        end = raw.rfind("]") + 1
 
-        if start == -1 or end == -1:
-            raise ValueError("No JSON array found")
+def summarize_batch(items: List[Dict]) -> List[Dict]:
+    if not items:
+        return []
 
-        parsed = json.loads(raw[start:end])
+    return asyncio.run(summarize_rows(items))
 
-        if not isinstance(parsed, list):
-            raise ValueError("Output is not a list")
 
-        return parsed
+def submit_summary_batch(items: List[Dict]) -> None:
+    """
+    Submit every claimed row to the OpenAI Batch API, one request per row
+    (same request shape as the realtime path), and attach the batch id to
+    the claims. Results are picked up by collect_summary_batches() on a
+    later run.
+    """
+    claimed_ids = [item["id"] for item in items]
+    requests = []
+    for item in items:
+        body = build_summary_request(item)
+        if body is not None:
+            requests.append({"custom_id": str(item["id"]), "body": body})
+
+    if not requests:
+        finish_news_claims(SUMMARY_JOB, claimed_ids, [])
+        return
 
+    try:
+        batch_id = submit_batch(client, requests)
     except Exception as e:
-        print(f"❌ Summary generation failed: {e}")
-        return []
+        print(f"❌ Summary batch submit failed: {e}")
+        finish_news_claims(SUMMARY_JOB, claimed_ids, [])
+        return
+
+    attach_news_batch(SUMMARY_JOB, claimed_ids, batch_id)
+    print(f"📤 Submitted summary batch {batch_id} | requests={len(requests)}")
+
+
+def collect_summary_batches() -> None:
+    """Write and settle every outstanding summary batch that has finished."""
+    for batch_id, news_ids in outstanding_news_batches(SUMMARY_JOB).items():
+        try:
+            outputs = fetch_batch_results(client, batch_id)
+        except Exception as e:
+            print(f"❌ Summary batch {batch_id} check failed: {e}")
+            continue
+
+        if outputs is None:
+            print(f"⏳ Summary batch {batch_id} still running")
+            continue
+
+        summarized = []
+        for custom_id, raw in outputs.items():
+            try:
+                summarized.append({"id": custom_id, "summary_400": parse_summary_response(raw)})
+            except Exception as e:
+                print(f"❌ Summary parse failed for {custom_id}: {e}")
+
+        store_summaries(news_ids, summarized, batch_id)
+
+
+def store_summaries(claimed_ids: List, summarized: List[Dict], batch_id: Optional[str] = None) -> None:
+    done_ids = []
+    if summarized:
+        updated = update_summary(summarized)
+        done_ids = [r["id"] for r in summarized if (r.get("summary_400") or "").strip()]
+        print(f"✅ Summarized {len(summarized)} items | updated={updated}")
+
+    finish_news_claims(SUMMARY_JOB, claimed_ids, done_ids, batch_id)
 
 
 # ------------------------
@@ -145,16 +256,20 @@ Input:
 def run():
     print("🚀 Summary_400 batch started")
 
-    rows = fetch_without_summary()
-    if not rows:
-        print("ℹ️ No rows pending summary")
-        return
-
-    summarized = summarize_batch(rows)
-
-    if summarized:
-        update_summary(summarized)
-        print(f"✅ Summarized {len(summarized)} items")
+    if batch_api_enabled():
+        # Settle batches submitted by earlier runs, then queue the next one
+        collect_summary_batches()
+        rows = fetch_without_summary(BATCH_API_FETCH_LIMIT, BATCH_CLAIM_LEASE_SECONDS)
+        if rows:
+            submit_summary_batch(rows)
+        else:
+            print("ℹ️ No rows pending summary")
+    else:
+        rows = fetch_without_summary(BATCH_SIZE)
+        if not rows:
+            print("ℹ️ No rows pending summary")
+            return
+        store_summaries([row["id"] for row in rows], summarize_batch(rows))
 
     print("🎉 Summary_400 batch completed")
 
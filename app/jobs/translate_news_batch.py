@@ -7,10 +7,27 @@ Batch translation job for news.
 
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from app.services.supabase_client import get_supabase
-from app.services.news_translator import translate_batch
+from app.services.news_translator import (
+    build_translation_request,
+    client as translator_client,
+    parse_translation_response,
+    translate_batch,
+)
+from app.services.news_job_claims import (
+    attach_news_batch,
+    claim_pending_news,
+    finish_news_claims,
+    outstanding_news_batches,
+)
+from app.services.openai_batch import (
+    BATCH_CLAIM_LEASE_SECONDS,
+    batch_api_enabled,
+    fetch_batch_results,
+    submit_batch,
+)
 
 # ------------------------
 # ENV
@@ -20,6 +37,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 load_dotenv(BASE_DIR / ".env")
 
 BATCH_SIZE = 10
+# Rows pulled per language when translations go through the Batch API
+BATCH_API_FETCH_LIMIT = 200
 
 # ✅ CREATE SUPABASE CLIENT ONCE (SAFE FOR CRON)
 supabase = get_supabase()
@@ -28,55 +47,120 @@ supabase = get_supabase()
 # DB HELPERS
 # ------------------------
 
-def fetch_untranslated(lang_code: str) -> List[dict]:
-    supabase = get_supabase()
-    column = "headline_te" if lang_code == "te" else "headline_hi"
-
-    res = (
-        supabase
-        .table("news")
-        .select("id, headline, matter")
-        .or_(f"{column}.is.null,{column}.eq.")
-        .limit(BATCH_SIZE)
-        .execute()
+def fetch_untranslated(
+    lang_code: str,
+    limit: int = BATCH_SIZE,
+    lease_seconds: Optional[int] = None,
+) -> List[dict]:
+    """
+    Claim rows whose headline for *lang_code* is NULL or empty.
+    Rows are leased by claim_pending_news so overlapping runs skip them.
+    """
+    return claim_pending_news(f"translate_{lang_code}", limit, lease_seconds)
+
+
+def update_translations(lang_code: str, translated_rows: List[dict]) -> int:
+    """
+    Write all translations for one language in a single round trip
+    (bulk_update_news RPC). Returns the number of news rows updated.
+    """
+    headline_col, matter_col = (
+        ("headline_te", "matter_te") if lang_code == "te" else ("headline_hi", "matter_hi")
     )
 
-    return res.data or []
-
-
-def update_translations(lang_code: str, translated_rows: List[dict]):
+    updates = []
+    skipped = 0
     for row in translated_rows:
         news_id = row.get("id")
         headline = row.get("headline")
-        matter = row.get("matter")
 
         if not news_id or not headline:
-            print("⚠️ Skipping invalid translation row:", row)
+            skipped += 1
             continue
 
-        if lang_code == "te":
-            updates = {
-                "headline_te": headline,
-                "matter_te": matter,
-            }
-        else:
-            updates = {
-                "headline_hi": headline,
-                "matter_hi": matter,
-            }
-
-        resp = (
-            supabase
-            .table("news")
-            .update(updates)
-            .eq("id", news_id)
-            .execute()
-        )
-
-        if not resp.data:
-            print(f"⚠️ Update affected 0 rows for id={news_id}")
-        else:
-            print(f"✅ Updated news id={news_id}")
+        updates.append({
+            "id": news_id,
+            headline_col: headline,
+            matter_col: row.get("matter"),
+        })
+
+    if skipped:
+        print(f"⚠️ Skipped {skipped} invalid translation rows")
+
+    if not updates:
+        return 0
+
+    res = supabase.rpc("bulk_update_news", {"p_rows": updates}).execute()
+    updated = int(res.data or 0)
+    if updated < len(updates):
+        print(f"⚠️ {len(updates) - updated} translation updates affected 0 rows")
+    return updated
+
+
+def submit_translation_batch(rows: List[dict], lang_code: str) -> None:
+    """
+    Submit every claimed row to the OpenAI Batch API, BATCH_SIZE rows per
+    request (same prompt shape as the realtime path), and attach the batch
+    id to the claims. collect_translation_batches() picks the results up on
+    a later run.
+    """
+    job = f"translate_{lang_code}"
+    claimed_ids = [row["id"] for row in rows]
+    requests = [
+        {
+            "custom_id": f"translate:{lang_code}:{offset}",
+            "body": build_translation_request(rows[offset:offset + BATCH_SIZE], lang_code),
+        }
+        for offset in range(0, len(rows), BATCH_SIZE)
+    ]
+
+    try:
+        batch_id = submit_batch(translator_client, requests)
+    except Exception as e:
+        print(f"❌ Translation batch submit failed for {lang_code}: {e}")
+        finish_news_claims(job, claimed_ids, [])
+        return
+
+    attach_news_batch(job, claimed_ids, batch_id)
+    print(f"📤 Submitted {lang_code.upper()} translation batch {batch_id} | requests={len(requests)}")
+
+
+def collect_translation_batches(lang_code: str) -> None:
+    """Write and settle every outstanding translation batch that has finished."""
+    for batch_id, news_ids in outstanding_news_batches(f"translate_{lang_code}").items():
+        try:
+            outputs = fetch_batch_results(translator_client, batch_id)
+        except Exception as e:
+            print(f"❌ Translation batch {batch_id} check failed: {e}")
+            continue
+
+        if outputs is None:
+            print(f"⏳ Translation batch {batch_id} still running")
+            continue
+
+        translated = []
+        for custom_id, raw in outputs.items():
+            try:
+                translated.extend(parse_translation_response(raw))
+            except Exception as e:
+                print(f"❌ Translation parse failed for {custom_id}: {e}")
+
+        store_translations(lang_code, news_ids, translated, batch_id)
+
+
+def store_translations(
+    lang_code: str,
+    claimed_ids: List,
+    translated: List[dict],
+    batch_id: Optional[str] = None,
+) -> None:
+    done_ids = []
+    if translated:
+        update_translations(lang_code, translated)
+        done_ids = [r["id"] for r in translated if r.get("id") and r.get("headline")]
+        print(f"✅ {lang_code.upper()} translated: {len(translated)} items")
+
+    finish_news_claims(f"translate_{lang_code}", claimed_ids, done_ids, batch_id)
 
 
 # ------------------------
@@ -86,18 +170,24 @@ def update_translations(lang_code: str, translated_rows: List[dict]):
 def run():
     print("🚀 News translation batch started")
 
+    use_batch_api = batch_api_enabled()
+
     for lang in ["te", "hi"]:
-        rows = fetch_untranslated(lang)
+        if use_batch_api:
+            # Settle batches submitted by earlier runs, then queue the next one
+            collect_translation_batches(lang)
+            rows = fetch_untranslated(lang, BATCH_API_FETCH_LIMIT, BATCH_CLAIM_LEASE_SECONDS)
+        else:
+            rows = fetch_untranslated(lang, BATCH_SIZE)
 
         if not rows:
             print(f"ℹ️ No untranslated rows for {lang}")
             continue
 
-        translated = translate_batch(rows, lang)
-
-        if translated:
-            update_translations(lang, translated)
-            print(f"✅ {lang.upper()} translated: {len(translated)} items")
+        if use_batch_api:
+            submit_translation_batch(rows, lang)
+        else:
+            store_translations(lang, [row["id"] for row in rows], translate_batch(rows, lang))
 
     print("🎉 Translation batch completed")
 
@@ -1,13 +1,17 @@
-import json
+import asyncio
+import importlib
 import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
 from app.db import engine
 from app.core.logging_setup import configure_logging
@@ -16,6 +20,8 @@ from app.middleware.security import SecurityLoggingMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.models.scam import Scam
 from app.services.firebase_service import send_push_notification
+from app.services.openai_client import close_async_openai
+from app.services.scan_history import stop_scan_history_writer
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -53,12 +59,48 @@ def _http_error_payload(exc: HTTPException) -> dict:
     return _normalize_error_detail(exc.detail, default_code="REQUEST_ERROR", default_message="Request failed")
 
 
+def _startup() -> None:
+    try:
+        Scam.__table__.create(bind=engine, checkfirst=True)
+        logger.info("scams_table_ready")
+    except Exception:
+        logger.exception("scams_table_create_failed")
+
+    try:
+        from app.services.news_ingestor import ingest_rss_in_background
+
+        ingest_rss_in_background()
+        logger.info("rss_ingestion_scheduled")
+    except Exception:
+        logger.exception("rss_ingestion_skipped")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("startup_begin")
+    await asyncio.to_thread(_startup)
+
+    if (os.getenv("LOG_ROUTES") or "false").strip().lower() == "true":
+        for route in app.routes:
+            logger.info("route_registered", extra={"path": getattr(route, "path", None)})
+
+    logger.info("startup_complete")
+    yield
+
+    # Flush scan_history rows still queued for the batched writer
+    await asyncio.to_thread(stop_scan_history_writer)
+    await close_async_openai()
+    logger.info("shutdown_complete")
+
+
 app = FastAPI(
     title="GO Suraksha API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -81,11 +123,13 @@ async def scan_http_exception_handler(request: Request, exc: HTTPException):
         logger.error("api_http_error", extra={"path": request.url.path, "status_code": exc.status_code, "error_code": payload.get("error_code")})
     elif exc.status_code == 401:
         logger.warning("authentication_failure", extra={"path": request.url.path, "error_code": payload.get("error_code")})
-    return JSONResponse(status_code=exc.status_code, content=payload)
+    return ORJSONResponse(status_code=exc.status_code, content=payload)
 
 
 @app.exception_handler(RequestValidationError)
 async def scan_validation_exception_handler(request: Request, exc: RequestValidationError):
+    # Stays on the stdlib encoder: each error's "input" echoes the client's
+    # value, and orjson rejects integers wider than 64 bits.
     return JSONResponse(
         status_code=422,
         content={
@@ -100,17 +144,21 @@ async def scan_validation_exception_handler(request: Request, exc: RequestValida
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.exception("api_unhandled_exception", extra={"path": request.url.path})
-    return JSONResponse(status_code=500, content=_error_payload(error_code="INTERNAL_ERROR", message="Something went wrong"))
+    return ORJSONResponse(status_code=500, content=_error_payload(error_code="INTERNAL_ERROR", message="Something went wrong"))
 
 
 app.add_middleware(SecurityLoggingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 
-configured_origins = os.getenv("CORS_ORIGINS", "").strip()
-allow_origins = [origin.strip() for origin in configured_origins.split(",") if origin.strip()] if configured_origins else []
+# Parsed once per process; CORSMiddleware only ever reads it.
+ALLOW_ORIGINS = tuple(
+    origin
+    for origin in (part.strip() for part in os.getenv("CORS_ORIGINS", "").split(","))
+    if origin
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allow_origins,
+    allow_origins=ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "User-Agent"],
@@ -148,8 +196,8 @@ async def success_response_envelope(request: Request, call_next):
         return response
 
     try:
-        payload = json.loads(body)
-    except json.JSONDecodeError:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
         return Response(
             content=body,
             status_code=response.status_code,
@@ -173,7 +221,7 @@ async def success_response_envelope(request: Request, call_next):
 
     headers = dict(response.headers)
     headers.pop("content-length", None)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=response.status_code,
         content=wrapped,
         headers=headers,
@@ -181,99 +229,80 @@ async def success_response_envelope(request: Request, call_next):
     )
 
 
-@app.on_event("startup")
-def startup():
-    logger.info("startup_begin")
-
-    try:
-        Scam.__table__.create(bind=engine, checkfirst=True)
-        logger.info("scams_table_ready")
-    except Exception:
-        logger.exception("scams_table_create_failed")
-
-    try:
-        from app.services.news_ingestor import ingest_rss
+# Added last so it is the outermost layer and compresses the enveloped body.
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
+# Dev-only: ?profile=1 returns a pyinstrument call-graph for the request.
+# pyinstrument comes from requirements-dev.txt, not requirements.txt.
+if os.getenv("ENABLE_PROFILER") == "1":
+    from app.middleware.profiler import ProfilerMiddleware
+
+    app.add_middleware(ProfilerMiddleware)
+
+
+# Routers in registration order: (app.routes module, attribute, include options).
+# Modules are imported here, once the app and its middleware exist.
+ROUTERS = [
+    ("auth", "router", {}),
+    ("profile", "router", {}),
+    ("news", "router", {}),
+    ("home", "router", {}),
+    ("history", "router", {}),
+    ("security", "router", {}),
+    ("trusted_contacts", "router", {"prefix": "/contacts", "tags": ["Contacts"]}),
+    ("trusted_contacts", "legacy_router", {}),
+    ("alerts", "router", {}),
+    ("ai", "router", {}),
+    ("risk", "router", {}),
+    ("risk_timeline", "router", {}),
+    ("risk_insights", "router", {}),
+    ("ai_explanations", "router", {}),
+    ("family", "router", {}),
+    ("trusted_alerts", "router", {}),
+    ("cyber_card", "router", {}),
+    ("scam_confirmation", "router", {}),
+    ("scam_network", "router", {}),
+    ("qr_secure", "router", {}),
+    ("media", "router", {}),
+    ("scan_password", "router", {}),
+    ("scan_email", "router", {}),
+    ("scan_qr", "router", {}),
+    ("scan_threat", "router", {}),
+    ("scan_image", "router", {}),
+    ("devices", "router", {}),
+    ("secure_now", "router", {}),
+    ("notifications", "router", {}),
+    ("billing", "router", {}),
+    ("webhooks", "router", {}),
+    ("admin", "router", {}),
+    ("search", "router", {}),
+    ("user_quota", "router", {}),
+    ("learning", "router", {}),
+    ("scams", "router", {}),
+]
+
+
+def _disabled_routers() -> frozenset[str]:
+    # Comma-separated app.routes module names to skip, e.g. "webhooks,admin",
+    # so dev environments need not import subsystems they do not use.
+    return frozenset(
+        name.strip()
+        for name in os.getenv("DISABLED_ROUTERS", "").split(",")
+        if name.strip()
+    )
 
-        ingest_rss()
-        logger.info("rss_ingestion_completed")
-    except Exception:
-        logger.exception("rss_ingestion_skipped")
 
-    logger.info("startup_complete")
+def _include_routers(app: FastAPI) -> None:
+    disabled = _disabled_routers()
+    for module_name, attr, options in ROUTERS:
+        if module_name in disabled:
+            logger.info("router_disabled", extra={"router": module_name})
+            continue
+        module = importlib.import_module(f"app.routes.{module_name}")
+        app.include_router(getattr(module, attr), **options)
 
 
-from app.routes.auth import router as auth_router
-from app.routes.profile import router as profile_router
-from app.routes.news import router as news_router
-from app.routes.home import router as home_router
-from app.routes.history import router as history_router
-from app.routes.security import router as security_router
-from app.routes.trusted_contacts import router as trusted_contacts_router, legacy_router as trusted_contacts_legacy_router
-from app.routes.alerts import router as alerts_router
-from app.routes.ai import router as ai_router
-from app.routes.risk import router as risk_router
-from app.routes.risk_timeline import router as risk_timeline_router
-from app.routes.risk_insights import router as risk_insights_router
-from app.routes.ai_explanations import router as ai_explanations_router
-from app.routes.family import router as family_router
-from app.routes.trusted_alerts import router as trusted_alerts_router
-from app.routes.cyber_card import router as cyber_card_router
-from app.routes.scam_confirmation import router as scam_confirmation_router
-from app.routes.scam_network import router as scam_network_router
-from app.routes.qr_secure import router as qr_secure_router
-from app.routes.media import router as media_router
-from app.routes.scan_password import router as scan_password_router
-from app.routes.scan_email import router as scan_email_router
-from app.routes.scan_qr import router as scan_qr_router
-from app.routes.scan_threat import router as scan_threat_router
-from app.routes.scan_image import router as scan_image_router
-from app.routes.devices import router as devices_router
-from app.routes.billing import router as billing_router
-from app.routes.webhooks import router as webhooks_router
-from app.routes.admin import router as admin_router
-from app.routes.search import router as search_router
-from app.routes.user_quota import router as user_quota_router
-from app.routes.secure_now import router as secure_now_router
-from app.routes.notifications import router as notifications_router
-from app.routes.learning import router as learning_router
-from app.routes.scams import router as scams_router
-
-app.include_router(auth_router)
-app.include_router(profile_router)
-app.include_router(news_router)
-app.include_router(home_router)
-app.include_router(history_router)
-app.include_router(security_router)
-app.include_router(trusted_contacts_router, prefix="/contacts", tags=["Contacts"])
-app.include_router(trusted_contacts_legacy_router)
-app.include_router(alerts_router)
-app.include_router(ai_router)
-app.include_router(risk_router)
-app.include_router(risk_timeline_router)
-app.include_router(risk_insights_router)
-app.include_router(ai_explanations_router)
-app.include_router(family_router)
-app.include_router(trusted_alerts_router)
-app.include_router(cyber_card_router)
-app.include_router(scam_confirmation_router)
-app.include_router(scam_network_router)
-app.include_router(qr_secure_router)
-app.include_router(media_router)
-app.include_router(scan_password_router)
-app.include_router(scan_email_router)
-app.include_router(scan_qr_router)
-app.include_router(scan_threat_router)
-app.include_router(scan_image_router)
-app.include_router(devices_router)
-app.include_router(secure_now_router)
-app.include_router(notifications_router)
-app.include_router(billing_router)
-app.include_router(webhooks_router)
-app.include_router(admin_router)
-app.include_router(search_router)
-app.include_router(user_quota_router)
-app.include_router(learning_router)
-app.include_router(scams_router)
+_include_routers(app)
 
 
 @app.get("/health")
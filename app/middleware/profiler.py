@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from urllib.parse import parse_qs
+
+from pyinstrument import Profiler
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ProfilerMiddleware:
+    """
+    On-demand request profiler (pure ASGI, dev only).
+
+    Requests carrying ``?profile=1`` run under pyinstrument and get the
+    call-graph back as HTML instead of the handler's response. Only
+    registered when ENABLE_PROFILER=1, so production never imports it;
+    pyinstrument is installed from requirements-dev.txt.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    @staticmethod
+    def _wants_profile(scope: Scope) -> bool:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return query.get("profile", [""])[-1] == "1"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message: Message) -> None:
+            # The profile report replaces the handler's own response
+            return None
+
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        await HTMLResponse(profiler.output_html())(scope, receive, send)
@@ -1,22 +1,25 @@
 import time
-import uuid
 import logging
-from typing import Callable
+from secrets import token_hex
 
 from fastapi import HTTPException
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.request_context import REQUEST_ID
 from app.routes.scan_base import build_scan_error
 from app.services.safe_response import safe_middleware_response
 
 logger = logging.getLogger(__name__)
 
+# Raw ASGI header name; the value is appended to http.response.start as a
+# pre-encoded tuple instead of going through MutableHeaders.
+_REQUEST_ID_HEADER = b"x-request-id"
 
-class SecurityLoggingMiddleware(BaseHTTPMiddleware):
+
+class SecurityLoggingMiddleware:
     """
-    Global security + audit middleware.
+    Global security + audit middleware (pure ASGI).
 
     - Adds request_id
     - Logs method, path, status, latency
@@ -28,30 +31,59 @@ class SecurityLoggingMiddleware(BaseHTTPMiddleware):
     # Paths where a structured JSON error body is preferred over an HTML 500
     _HANDLED_PREFIXES = ("/scan", "/qr", "/alerts", "/trusted", "/search")
 
+    # Probe endpoints hit at high rate; only failures are worth a log line
+    _UNLOGGED_PATHS = frozenset({"/health"})
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
     @classmethod
     def _is_handled_path(cls, path: str) -> bool:
         return any(path.startswith(p) for p in cls._HANDLED_PREFIXES)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = str(uuid.uuid4())
-        start_time = time.time()
-
-        # Attach request_id to request state
-        request.state.request_id = request_id
-
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = token_hex(16)
+        start_ns = time.perf_counter_ns()
+        path = scope["path"]
+        method = scope["method"]
+
+        # Attach request_id to request state (backs request.state)
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+
+        request_id_header = (_REQUEST_ID_HEADER, request_id.encode("ascii"))
+        status_code = 500
+        response_started = False
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                # Expose request id to client (VERY useful for support/debug)
+                message["headers"] = [*message.get("headers", []), request_id_header]
+            await send(message)
+
+        request_id_token = REQUEST_ID.set(request_id)
         try:
-            response = await call_next(request)
-            status_code = response.status_code
+            await self.app(scope, receive, send_with_request_id)
         except Exception as exc:
-            status_code = getattr(exc, "status_code", 500)
             logger.exception(
                 "request_failed",
                 extra={
                     "request_id": request_id,
-                    "path": request.url.path,
-                    "method": request.method,
+                    "path": path,
+                    "method": method,
                 },
             )
+            if response_started:
+                # Too late to swap in a JSON body
+                raise
+
             if isinstance(exc, HTTPException) and isinstance(exc.detail, dict):
                 # Route already built a structured error payload — pass it through.
                 # Use the original status code so 400/429 are preserved for clients
@@ -59,49 +91,61 @@ class SecurityLoggingMiddleware(BaseHTTPMiddleware):
                 raw_status = exc.status_code
                 out_status = (
                     200
-                    if raw_status >= 500 and self._is_handled_path(request.url.path)
+                    if raw_status >= 500 and self._is_handled_path(path)
                     else raw_status
                 )
-                response = JSONResponse(status_code=out_status, content=exc.detail)
-            elif self._is_handled_path(request.url.path):
+                response = ORJSONResponse(status_code=out_status, content=exc.detail)
+            elif self._is_handled_path(path):
                 # Unhandled exception on a known API path — return a safe 200 JSON
                 payload = build_scan_error(
                     "SCAN_PROCESSING_ERROR",
                     "Scan could not be completed.",
                 )
-                response = JSONResponse(status_code=200, content=payload)
+                response = ORJSONResponse(status_code=200, content=payload)
             else:
                 # Unknown path — still return JSON 200 rather than crashing the server
                 logger.exception(
                     "middleware_failure",
-                    extra={"request_id": request_id, "path": request.url.path},
+                    extra={"request_id": request_id, "path": path},
                 )
-                response = JSONResponse(
+                response = ORJSONResponse(
                     status_code=200,
                     content=safe_middleware_response(),
                 )
+            await response(scope, receive, send_with_request_id)
+            # Log the original failure status, as before
+            status_code = getattr(exc, "status_code", 500)
+        finally:
+            REQUEST_ID.reset(request_id_token)
+
+        if path in self._UNLOGGED_PATHS and status_code < 500:
+            return
+        # Skip building the extras when INFO is filtered out
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
         # Extract user_id safely (never assume)
-        user_id = None
-        try:
-            user = getattr(request.state, "user", None)
-            if user and hasattr(user, "id"):
-                user_id = str(user.id)
-        except Exception:
-            user_id = None
+        user_id = getattr(state.get("user"), "id", None)
+        if user_id is not None:
+            user_id = str(user_id)
 
         # Client info
-        client_ip = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
+        client = scope.get("client")
+        client_ip = client[0] if client else None
+        user_agent = None
+        for name, value in scope["headers"]:
+            if name == b"user-agent":
+                user_agent = value.decode("latin-1")
+                break
 
         logger.info(
             "request_completed",
             extra={
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
+                "method": method,
+                "path": path,
                 "status_code": status_code,
                 "duration_ms": duration_ms,
                 "user_id": user_id,
@@ -109,7 +153,3 @@ class SecurityLoggingMiddleware(BaseHTTPMiddleware):
                 "user_agent": user_agent,
             },
         )
-
-        # Expose request id to client (VERY useful for support/debug)
-        response.headers["X-Request-ID"] = request_id
-        return response
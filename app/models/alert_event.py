@@ -9,6 +9,7 @@ class AlertEvent(Base):
     __tablename__ = "alert_events"
     __table_args__ = (
         Index("ix_alert_events_user_media_time", "user_id", "media_hash", "created_at"),
+        Index("ix_alert_events_user_created_at", "user_id", text("created_at DESC")),
     )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -20,7 +20,8 @@ class QrReputation(Base):
     __tablename__ = "qr_reputations"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    qr_hash = Column(String(256), nullable=False, unique=True, index=True)
+    # sha256 hex digest; the UNIQUE constraint's btree serves lookups
+    qr_hash = Column(String(64), nullable=False, unique=True)
     reported_count = Column(Integer, nullable=False, server_default=text("0"))
     is_flagged = Column(Boolean, nullable=False, server_default=text("false"))
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -34,7 +35,7 @@ class QrScanLog(Base):
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    qr_hash = Column(String(256), nullable=False, index=True)
+    qr_hash = Column(String(64), nullable=False, index=True)
     vpa = Column(String(255), nullable=False)
     is_business = Column(Boolean, nullable=False, server_default=text("false"))
     scam_flag = Column(Boolean, nullable=False, server_default=text("false"))
@@ -50,6 +51,7 @@ class QrReport(Base):
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    qr_hash = Column(String(256), nullable=False, index=True)
+    # Lookups use ix_qr_reports_qr_hash_created_at, which leads with qr_hash
+    qr_hash = Column(String(64), nullable=False)
     reason = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
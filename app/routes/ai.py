@@ -1,7 +1,11 @@
-from typing import List
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Tuple
 
 from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 from redis.exceptions import RedisError
 
 from app.core.features import Limit, get_global_limit
@@ -11,7 +15,7 @@ router = APIRouter(prefix="/ai", tags=["AI Insights"])
 
 
 class InsightRequest(BaseModel):
-    input_text: str
+    input_text: str = Field(..., max_length=2000)
     analysis_result: dict
 
 
@@ -46,65 +50,103 @@ def _enforce_rate_limit(client_ip: str):
         )
 
 
+# Keyword -> scam type, in priority order: when several types match, the
+# earliest entry wins regardless of where its keyword appears in the text.
+_SCAM_KEYWORDS = (
+    ("Banking / UPI Scam", ("otp", "bank", "upi")),
+    ("Job Scam", ("job", "offer")),
+    ("Investment Scam", ("crypto", "investment")),
+    ("Courier Scam", ("delivery", "courier")),
+)
+_SCAM_PRIORITY = {scam_type: rank for rank, (scam_type, _) in enumerate(_SCAM_KEYWORDS)}
+_KEYWORD_TO_TYPE = {
+    keyword: scam_type
+    for scam_type, keywords in _SCAM_KEYWORDS
+    for keyword in keywords
+}
+# Zero-width lookahead so findall reports a match at every position,
+# including keywords that overlap ("jobank" holds both "job" and "bank").
+_KEYWORD_RE = re.compile("(?=(" + "|".join(_KEYWORD_TO_TYPE) + "))")
+
+
+# Template and campaign messages repeat often; short inputs are memoised so
+# repeats skip the regex scan. Longer texts are classified directly to keep
+# the cache bounded (~4096 x 512 chars per worker).
+_SCAM_TYPE_CACHE_SIZE = 4096
+_MAX_CACHED_TEXT_LEN = 512
+
+
 def derive_scam_type(text: str) -> str:
-    lowered = text.lower()
-    if "otp" in lowered or "bank" in lowered or "upi" in lowered:
-        return "Banking / UPI Scam"
-    if "job" in lowered or "offer" in lowered:
-        return "Job Scam"
-    if "crypto" in lowered or "investment" in lowered:
-        return "Investment Scam"
-    if "delivery" in lowered or "courier" in lowered:
-        return "Courier Scam"
-    return "General Scam"
+    if len(text) <= _MAX_CACHED_TEXT_LEN:
+        return _derive_scam_type_cached(text)
+    return _derive_scam_type(text)
+
+
+@lru_cache(maxsize=_SCAM_TYPE_CACHE_SIZE)
+def _derive_scam_type_cached(text: str) -> str:
+    return _derive_scam_type(text)
+
+
+def _derive_scam_type(text: str) -> str:
+    # One pass over the lowered text for every keyword. Matching on lower()
+    # rather than re.IGNORECASE keeps every hit an exact dict key ("İ" and
+    # "ı" case-fold to "i" under IGNORECASE but not under lower()).
+    matched = {_KEYWORD_TO_TYPE[hit] for hit in _KEYWORD_RE.findall(text.lower())}
+    if not matched:
+        return "General Scam"
+    return min(matched, key=_SCAM_PRIORITY.__getitem__)
+
+
+TARGET_GROUPS = MappingProxyType({
+    "Banking / UPI Scam": "General public",
+    "Job Scam": "Job seekers",
+    "Investment Scam": "Retail investors",
+    "Courier Scam": "Online shoppers",
+    "General Scam": "All users"
+})
+
+SCAM_ACTIONS = MappingProxyType({
+    "Banking / UPI Scam": (
+        "Do not share OTP or PIN",
+        "Contact your bank immediately",
+        "Block the sender"
+    ),
+    "Job Scam": (
+        "Do not pay registration fees",
+        "Verify company on official website",
+        "Ignore unofficial recruiters"
+    ),
+    "Investment Scam": (
+        "Do not send money",
+        "Avoid guaranteed return promises",
+        "Consult a financial advisor"
+    ),
+    "Courier Scam": (
+        "Do not click tracking links",
+        "Check courier status on official site",
+        "Ignore urgent payment requests"
+    ),
+    "General Scam": (
+        "Do not click unknown links",
+        "Do not share personal information",
+        "Report and block the sender"
+    )
+})
 
 
 def target_group_for(scam_type: str) -> str:
-    mapping = {
-        "Banking / UPI Scam": "General public",
-        "Job Scam": "Job seekers",
-        "Investment Scam": "Retail investors",
-        "Courier Scam": "Online shoppers",
-        "General Scam": "All users"
-    }
-    return mapping.get(scam_type, "All users")
-
-
-def actions_for(scam_type: str) -> List[str]:
-    mapping = {
-        "Banking / UPI Scam": [
-            "Do not share OTP or PIN",
-            "Contact your bank immediately",
-            "Block the sender"
-        ],
-        "Job Scam": [
-            "Do not pay registration fees",
-            "Verify company on official website",
-            "Ignore unofficial recruiters"
-        ],
-        "Investment Scam": [
-            "Do not send money",
-            "Avoid guaranteed return promises",
-            "Consult a financial advisor"
-        ],
-        "Courier Scam": [
-            "Do not click tracking links",
-            "Check courier status on official site",
-            "Ignore urgent payment requests"
-        ],
-        "General Scam": [
-            "Do not click unknown links",
-            "Do not share personal information",
-            "Report and block the sender"
-        ]
-    }
-    return mapping.get(scam_type, [])
+    return TARGET_GROUPS.get(scam_type, "All users")
+
+
+def actions_for(scam_type: str) -> Tuple[str, ...]:
+    return SCAM_ACTIONS.get(scam_type, ())
 
 
 @router.post("/insight", response_model=InsightResponse)
-def generate_insight(payload: InsightRequest, request: Request):
+async def generate_insight(payload: InsightRequest, request: Request):
     client_ip = request.client.host if request.client else "unknown"
-    _enforce_rate_limit(client_ip)
+    # The rate-limit check is sync Redis I/O; keep it off the event loop
+    await run_in_threadpool(_enforce_rate_limit, client_ip)
 
     scam_type = derive_scam_type(payload.input_text)
     risk_level = payload.analysis_result.get("risk_level", "Unknown")
@@ -2,7 +2,8 @@ import uuid
 import json
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session
 
 from app.core.features import Feature
@@ -15,6 +16,20 @@ from app.services.threat.threat_analyzer import analyze_threat
 
 router = APIRouter(prefix="/ai", tags=["AI Explanations"])
 
+# Ids are bound as native uuid parameters, so Postgres does not re-parse
+# a text literal per request.
+SCAN_LOOKUP_SQL = text(
+    """
+    SELECT risk, score, reasons
+    FROM scan_history
+    WHERE id = :sid
+      AND user_id = :uid
+    """
+).bindparams(
+    bindparam("sid", type_=UUID(as_uuid=True)),
+    bindparam("uid", type_=UUID(as_uuid=True)),
+)
+
 
 @router.post("/explain", response_model=ExplainScanResponse)
 def explain_scan(
@@ -25,17 +40,13 @@ def explain_scan(
     if not payload.scan_id and not payload.text:
         raise HTTPException(status_code=400, detail="scan_id or text required")
 
-    scan = db.execute(
-        text(
-            """
-            SELECT risk, score, reasons
-            FROM scan_history
-            WHERE id = CAST(:sid AS uuid)
-              AND user_id = CAST(:uid AS uuid)
-            """
-        ),
-        {"sid": payload.scan_id or "00000000-0000-0000-0000-000000000000", "uid": str(current_user.id)},
-    ).mappings().first()
+    scan = None
+    scan_uuid = _parse_scan_id(payload.scan_id)
+    if scan_uuid is not None:
+        scan = db.execute(
+            SCAN_LOOKUP_SQL,
+            {"sid": scan_uuid, "uid": current_user.id},
+        ).mappings().first()
 
     if not scan and not payload.text:
         raise HTTPException(status_code=404, detail="Scan not found")
@@ -61,6 +72,15 @@ def explain_scan(
     return ExplainScanResponse(scan_id=payload.scan_id or str(uuid.uuid4()), ai_explanation=explanation)
 
 
+def _parse_scan_id(scan_id: str | None) -> uuid.UUID | None:
+    if not scan_id:
+        return None
+    try:
+        return uuid.UUID(scan_id)
+    except ValueError:
+        return None
+
+
 def _coerce_scan_reasons(raw_reasons):
     if raw_reasons is None:
         return []
@@ -3,7 +3,8 @@ from typing import List
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -19,6 +20,124 @@ from app.services.security_plan_limits import allows_automatic_trusted_alerts, a
 router = APIRouter(prefix="/alerts", tags=["Alerts"])
 logger = logging.getLogger(__name__)
 
+# current_user.id is already a uuid.UUID; binding it natively avoids a
+# str() per request and a text -> uuid CAST per execution.
+_UID_PARAM = bindparam("uid", type_=UUID(as_uuid=True))
+
+# Statements are built once at import; SQLAlchemy's compiled cache then
+# keys on the same TextClause every request instead of a fresh one.
+COUNT_ALERTS_SQL = text(
+    "SELECT COUNT(*) FROM alert_events WHERE user_id = :uid"
+).bindparams(_UID_PARAM)
+
+LIST_ALERTS_SQL = text(
+    """
+    SELECT id, analysis_type, risk_score, created_at, status
+    FROM alert_events
+    WHERE user_id = :uid
+    ORDER BY created_at DESC
+    LIMIT :limit OFFSET :offset
+    """
+).bindparams(_UID_PARAM)
+
+ALERT_SUMMARY_SQL = text(
+    """
+    SELECT
+        COUNT(*)                                           AS total,
+        COUNT(*) FILTER (WHERE score >= 70)                AS high,
+        COUNT(*) FILTER (WHERE score >= 40 AND score < 70) AS medium,
+        COUNT(*) FILTER (WHERE score < 40)                 AS low
+    FROM (
+        -- User's own alerts
+        SELECT COALESCE(risk_score, 0) AS score FROM alert_events
+        WHERE user_id = :uid
+
+        UNION ALL
+
+        -- Family / trusted contacts' alerts (registered GO Suraksha users only)
+        SELECT COALESCE(ae.risk_score, 0)
+        FROM alert_events ae
+        JOIN trusted_contacts tc
+          ON ae.user_id = tc.contact_user_id
+        WHERE tc.owner_user_id  = :uid
+          AND tc.status         = 'ACTIVE'
+          AND tc.contact_user_id IS NOT NULL
+    ) scores
+    """
+).bindparams(_UID_PARAM)
+
+FAMILY_ACTIVITY_SQL = text(
+    """
+    SELECT
+        COALESCE(u.name, tc.name, 'Family Member')  AS member_name,
+        UPPER(COALESCE(sh.scan_type, 'TEXT'))        AS scan_type,
+        UPPER(COALESCE(sh.risk, 'UNKNOWN'))          AS risk_level,
+        LEFT(COALESCE(sh.input_text, ''), 60)        AS scan_input,
+        sh.created_at
+    FROM trusted_contacts tc
+    LEFT JOIN users u
+           ON u.id = tc.contact_user_id
+    LEFT JOIN scan_history sh
+           ON sh.user_id = tc.contact_user_id
+    WHERE tc.owner_user_id = :uid
+      AND tc.status        = 'ACTIVE'
+      AND sh.id IS NOT NULL
+      AND sh.risk IN ('medium', 'high', 'MEDIUM', 'HIGH')
+    ORDER BY sh.created_at DESC
+    LIMIT :limit
+    """
+).bindparams(_UID_PARAM)
+
+FAMILY_FEED_SQL = text(
+    """
+    SELECT
+        COALESCE(u.name, tc.name, 'Family Member') AS member_name,
+        UPPER(COALESCE(ae.scan_type, ae.analysis_type, 'SCAN')) AS scan_type,
+        ae.risk_score,
+        ae.created_at
+    FROM trusted_contacts tc
+    LEFT JOIN users u
+           ON u.id = tc.contact_user_id
+    JOIN alert_events ae
+           ON ae.user_id = tc.contact_user_id
+    WHERE tc.owner_user_id   = :uid
+      AND tc.status          = 'ACTIVE'
+      AND tc.contact_user_id IS NOT NULL
+      AND ae.risk_score      >= 40
+    ORDER BY ae.created_at DESC
+    LIMIT :limit
+    """
+).bindparams(_UID_PARAM)
+
+DEBUG_LATEST_ALERTS_SQL = text(
+    """
+    SELECT id, analysis_type, scan_type, risk_score, risk_level,
+           status, created_at, extra_signals
+    FROM alert_events
+    WHERE user_id = :uid
+    ORDER BY created_at DESC
+    LIMIT 10
+    """
+).bindparams(_UID_PARAM)
+
+RECENT_ALERT_COUNT_SQL = text(
+    """
+    SELECT COUNT(*) FROM alert_events
+    WHERE user_id = :uid
+      AND created_at > NOW() - INTERVAL '5 minutes'
+    """
+).bindparams(_UID_PARAM)
+
+ACTIVE_CONTACT_SQL = text(
+    """
+    SELECT id
+    FROM trusted_contacts
+    WHERE owner_user_id = :uid
+      AND status = 'ACTIVE'
+    LIMIT 1
+    """
+).bindparams(_UID_PARAM)
+
 
 class ManualAlertTriggerRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -36,18 +155,10 @@ def list_alerts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    total = db.execute(text("SELECT COUNT(*) FROM alert_events WHERE user_id = CAST(:uid AS uuid)"), {"uid": str(current_user.id)}).scalar()
+    total = db.execute(COUNT_ALERTS_SQL, {"uid": current_user.id}).scalar()
     rows = db.execute(
-        text(
-            """
-            SELECT id, analysis_type, risk_score, created_at, status
-            FROM alert_events
-            WHERE user_id = CAST(:uid AS uuid)
-            ORDER BY created_at DESC
-            LIMIT :limit OFFSET :offset
-            """
-        ),
-        {"uid": str(current_user.id), "limit": limit, "offset": offset},
+        LIST_ALERTS_SQL,
+        {"uid": current_user.id, "limit": limit, "offset": offset},
     ).mappings().all()
     alerts = [_build_alert_response(row) for row in rows]
     payload = {"alerts": alerts, "total": int(total or 0), "page": (offset // limit) + 1}
@@ -61,32 +172,17 @@ def alert_summary(current_user: User = Depends(get_current_user), db: Session =
     registered trusted contacts (family members on GO Suraksha).
     This gives a holistic threat picture on the Alerts summary card.
     """
-    rows = db.execute(
-        text(
-            """
-            -- User's own alerts
-            SELECT risk_score FROM alert_events
-            WHERE user_id = CAST(:uid AS uuid)
-
-            UNION ALL
-
-            -- Family / trusted contacts' alerts (registered GO Suraksha users only)
-            SELECT ae.risk_score
-            FROM alert_events ae
-            JOIN trusted_contacts tc
-              ON ae.user_id = tc.contact_user_id
-            WHERE tc.owner_user_id  = CAST(:uid AS uuid)
-              AND tc.status         = 'ACTIVE'
-              AND tc.contact_user_id IS NOT NULL
-            """
-        ),
-        {"uid": str(current_user.id)},
-    ).mappings().all()
-
-    high_count   = sum(1 for r in rows if int(r["risk_score"] or 0) >= 70)
-    medium_count = sum(1 for r in rows if 40 <= int(r["risk_score"] or 0) < 70)
-    low_count    = sum(1 for r in rows if int(r["risk_score"] or 0) < 40)
-    total        = len(rows)
+    # Bucket counts are computed in Postgres: one row comes back instead
+    # of every risk_score for the user and their family circle.
+    counts = db.execute(
+        ALERT_SUMMARY_SQL,
+        {"uid": current_user.id},
+    ).mappings().one()
+
+    high_count   = counts["high"]
+    medium_count = counts["medium"]
+    low_count    = counts["low"]
+    total        = counts["total"]
 
     logger.info(
         "alerts_summary",
@@ -121,28 +217,8 @@ def family_activity(
     BUG FIX: was using sh.type (wrong); corrected to sh.scan_type.
     """
     rows = db.execute(
-        text(
-            """
-            SELECT
-                COALESCE(u.name, tc.name, 'Family Member')  AS member_name,
-                UPPER(COALESCE(sh.scan_type, 'TEXT'))        AS scan_type,
-                UPPER(COALESCE(sh.risk, 'UNKNOWN'))          AS risk_level,
-                LEFT(COALESCE(sh.input_text, ''), 60)        AS scan_input,
-                sh.created_at
-            FROM trusted_contacts tc
-            LEFT JOIN users u
-                   ON u.id = tc.contact_user_id
-            LEFT JOIN scan_history sh
-                   ON sh.user_id = tc.contact_user_id
-            WHERE tc.owner_user_id = CAST(:uid AS uuid)
-              AND tc.status        = 'ACTIVE'
-              AND sh.id IS NOT NULL
-              AND sh.risk IN ('medium', 'high', 'MEDIUM', 'HIGH')
-            ORDER BY sh.created_at DESC
-            LIMIT :limit
-            """
-        ),
-        {"uid": str(current_user.id), "limit": limit},
+        FAMILY_ACTIVITY_SQL,
+        {"uid": current_user.id, "limit": limit},
     ).mappings().all()
 
     activity = [
@@ -170,27 +246,8 @@ def family_feed(
     includes push-notification delivery context and richer severity data.
     """
     rows = db.execute(
-        text(
-            """
-            SELECT
-                COALESCE(u.name, tc.name, 'Family Member') AS member_name,
-                UPPER(COALESCE(ae.scan_type, ae.analysis_type, 'SCAN')) AS scan_type,
-                ae.risk_score,
-                ae.created_at
-            FROM trusted_contacts tc
-            LEFT JOIN users u
-                   ON u.id = tc.contact_user_id
-            JOIN alert_events ae
-                   ON ae.user_id = tc.contact_user_id
-            WHERE tc.owner_user_id   = CAST(:uid AS uuid)
-              AND tc.status          = 'ACTIVE'
-              AND tc.contact_user_id IS NOT NULL
-              AND ae.risk_score      >= 40
-            ORDER BY ae.created_at DESC
-            LIMIT :limit
-            """
-        ),
-        {"uid": str(current_user.id), "limit": limit},
+        FAMILY_FEED_SQL,
+        {"uid": current_user.id, "limit": limit},
     ).mappings().all()
 
     feed = [
@@ -217,17 +274,8 @@ def debug_latest_alerts(
     working correctly after scans.  No sensitive data beyond the user's own.
     """
     rows = db.execute(
-        text(
-            """
-            SELECT id, analysis_type, scan_type, risk_score, risk_level,
-                   status, created_at, extra_signals
-            FROM alert_events
-            WHERE user_id = CAST(:uid AS uuid)
-            ORDER BY created_at DESC
-            LIMIT 10
-            """
-        ),
-        {"uid": str(current_user.id)},
+        DEBUG_LATEST_ALERTS_SQL,
+        {"uid": current_user.id},
     ).mappings().all()
 
     alerts = [
@@ -253,14 +301,8 @@ def refresh_alerts(
 ):
     """Trigger a manual refresh check. Returns count of any new alerts created."""
     new_count = db.execute(
-        text(
-            """
-            SELECT COUNT(*) FROM alert_events
-            WHERE user_id = CAST(:uid AS uuid)
-              AND created_at > NOW() - INTERVAL '5 minutes'
-            """
-        ),
-        {"uid": str(current_user.id)},
+        RECENT_ALERT_COUNT_SQL,
+        {"uid": current_user.id},
     ).scalar()
     return {"status": "ok", "new_alerts_created": int(new_count or 0)}
 
@@ -291,16 +333,8 @@ def trigger_media_alert(
 
     if allows_automatic_trusted_alerts(current_user.plan):
         contact = db.execute(
-            text(
-                """
-                SELECT id
-                FROM trusted_contacts
-                WHERE owner_user_id = CAST(:uid AS uuid)
-                  AND status = 'ACTIVE'
-                LIMIT 1
-                """
-            ),
-            {"uid": user_id},
+            ACTIVE_CONTACT_SQL,
+            {"uid": current_user.id},
         ).first()
         if not contact:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No trusted contact configured")
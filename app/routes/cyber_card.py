@@ -29,6 +29,72 @@ router = APIRouter(prefix="/cyber-card", tags=["Cyber Card"])
 # How long (seconds) a cached score is considered fresh before recomputing
 _CACHE_TTL_SECONDS = 300  # 5 minutes
 
+# Same compact jsonb encoder as the monthly batch job.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+# Score-month lookup, UPDATE of this month's row and INSERT when there was
+# none, in a single round trip. The month boundary matches the batch job.
+_UPSERT_SCORE_SQL = text(
+    """
+    WITH bounds AS (
+        SELECT date_trunc('month', now() AT TIME ZONE 'Asia/Kolkata') AS score_month
+    ),
+    updated AS (
+        UPDATE cyber_card_scores AS c
+        SET score      = :score,
+            risk_level = :risk_level,
+            factors    = CAST(:factors  AS jsonb),
+            insights   = CAST(:insights AS jsonb),
+            actions    = CAST(:actions  AS jsonb),
+            updated_at = now()
+        FROM bounds
+        WHERE c.user_id = CAST(:uid AS uuid)
+          AND c.score_month = bounds.score_month
+        RETURNING c.id
+    )
+    INSERT INTO cyber_card_scores (
+        id, user_id, score, max_score, risk_level,
+        signals, factors, insights, actions,
+        score_month, updated_at
+    )
+    SELECT
+        CAST(:id AS uuid), CAST(:uid AS uuid),
+        :score, 1000, :risk_level,
+        '{}',
+        CAST(:factors  AS jsonb),
+        CAST(:insights AS jsonb),
+        CAST(:actions  AS jsonb),
+        bounds.score_month, now()
+    FROM bounds
+    WHERE NOT EXISTS (SELECT 1 FROM updated)
+    """
+)
+
+# Pre-V2 schema (no factors/insights/actions/updated_at columns).
+_LEGACY_UPSERT_SCORE_SQL = text(
+    """
+    WITH bounds AS (
+        SELECT date_trunc('month', now() AT TIME ZONE 'Asia/Kolkata') AS score_month
+    ),
+    updated AS (
+        UPDATE cyber_card_scores AS c
+        SET score = :score, risk_level = :risk_level
+        FROM bounds
+        WHERE c.user_id = CAST(:uid AS uuid)
+          AND c.score_month = bounds.score_month
+        RETURNING c.id
+    )
+    INSERT INTO cyber_card_scores (
+        id, user_id, score, max_score, risk_level, signals, score_month
+    )
+    SELECT
+        CAST(:id AS uuid), CAST(:uid AS uuid),
+        :score, 1000, :risk_level, '{}', bounds.score_month
+    FROM bounds
+    WHERE NOT EXISTS (SELECT 1 FROM updated)
+    """
+)
+
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -193,117 +259,25 @@ def _compute_and_upsert(db: Session, user_id: str) -> None:
         score  = result["score"]
         level  = result["level"]
 
-        month_start = db.execute(
-            text(
-                "SELECT date_trunc('month', now() AT TIME ZONE 'Asia/Kolkata')"
-            )
-        ).scalar()
-
         risk_label = get_risk_level(score)
-        factors_j  = json.dumps(result["factors"])
-        insights_j = json.dumps(result["insights"])
-        actions_j  = json.dumps(result["actions"])
+        params = {
+            "id":         str(uuid.uuid4()),
+            "uid":        user_id,
+            "score":      score,
+            "risk_level": risk_label,
+            "factors":    _encode_json(result["factors"]),
+            "insights":   _encode_json(result["insights"]),
+            "actions":    _encode_json(result["actions"]),
+        }
 
-        # ── Resilient SELECT-first INSERT/UPDATE (no unique constraint required)
+        # ── Update-else-insert in one statement (no unique constraint required)
         # Falls back to ON CONFLICT once migration 20260327_01 is applied.
-        existing_id = db.execute(
-            text(
-                """
-                SELECT id FROM cyber_card_scores
-                WHERE user_id = CAST(:uid AS uuid) AND score_month = :month
-                LIMIT 1
-                """
-            ),
-            {"uid": user_id, "month": month_start},
-        ).scalar()
-
-        if existing_id:
-            # Row already exists — UPDATE it
-            try:
-                db.execute(
-                    text(
-                        """
-                        UPDATE cyber_card_scores
-                        SET score      = :score,
-                            risk_level = :risk_level,
-                            factors    = CAST(:factors  AS jsonb),
-                            insights   = CAST(:insights AS jsonb),
-                            actions    = CAST(:actions  AS jsonb),
-                            updated_at = now()
-                        WHERE id = CAST(:existing_id AS uuid)
-                        """
-                    ),
-                    {
-                        "score":       score,
-                        "risk_level":  risk_label,
-                        "factors":     factors_j,
-                        "insights":    insights_j,
-                        "actions":     actions_j,
-                        "existing_id": str(existing_id),
-                    },
-                )
-            except Exception:
-                # V2 columns absent — legacy UPDATE
-                db.rollback()
-                db.execute(
-                    text(
-                        """
-                        UPDATE cyber_card_scores
-                        SET score = :score, risk_level = :risk_level
-                        WHERE id = CAST(:existing_id AS uuid)
-                        """
-                    ),
-                    {"score": score, "risk_level": risk_label, "existing_id": str(existing_id)},
-                )
-        else:
-            # No row yet — INSERT
-            new_id = str(uuid.uuid4())
-            try:
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO cyber_card_scores (
-                            id, user_id, score, max_score, risk_level,
-                            signals, factors, insights, actions,
-                            score_month, updated_at
-                        ) VALUES (
-                            CAST(:id AS uuid), CAST(:uid AS uuid),
-                            :score, 1000, :risk_level,
-                            '{}',
-                            CAST(:factors  AS jsonb),
-                            CAST(:insights AS jsonb),
-                            CAST(:actions  AS jsonb),
-                            :month, now()
-                        )
-                        """
-                    ),
-                    {
-                        "id":         new_id,
-                        "uid":        user_id,
-                        "score":      score,
-                        "risk_level": risk_label,
-                        "factors":    factors_j,
-                        "insights":   insights_j,
-                        "actions":    actions_j,
-                        "month":      month_start,
-                    },
-                )
-            except Exception:
-                # V2 columns absent — legacy INSERT
-                db.rollback()
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO cyber_card_scores (
-                            id, user_id, score, max_score, risk_level, signals, score_month
-                        ) VALUES (
-                            CAST(:id AS uuid), CAST(:uid AS uuid),
-                            :score, 1000, :risk_level, '{}', :month
-                        )
-                        """
-                    ),
-                    {"id": new_id, "uid": user_id, "score": score, "risk_level": risk_label, "month": month_start},
-                )
+        try:
+            db.execute(_UPSERT_SCORE_SQL, params)
+        except Exception:
+            # V2 columns absent — legacy update-else-insert
+            db.rollback()
+            db.execute(_LEGACY_UPSERT_SCORE_SQL, params)
 
         db.commit()
         logger.info(
@@ -4,15 +4,75 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 from app.db import get_db
 from app.models.user import User
 from app.routes.auth import get_current_user
+from app.services.scan_history import invalidate_keyword_counts
 
 router = APIRouter(prefix="/history", tags=["History"])
 
+# current_user.id is bound natively as a uuid (no str() + CAST per request),
+# and every statement is built once at import.
+_USER_ID_PARAM = bindparam("user_id", type_=UUID(as_uuid=True))
+
+LIST_HISTORY_SQL = text("""
+    SELECT
+        id,
+        input_text,
+        risk,
+        score,
+        reasons,
+        scan_type,
+        created_at
+    FROM scan_history
+    WHERE user_id = :user_id
+    ORDER BY created_at DESC
+    LIMIT :limit OFFSET :offset
+""").bindparams(_USER_ID_PARAM)
+
+COUNT_HISTORY_SQL = text("""
+    SELECT COUNT(*)
+    FROM scan_history
+    WHERE user_id = :user_id
+""").bindparams(_USER_ID_PARAM)
+
+DEBUG_SCANS_SQL = text("""
+    SELECT
+        id,
+        scan_type,
+        risk,
+        score,
+        created_at
+    FROM scan_history
+    WHERE user_id = :user_id
+    ORDER BY created_at DESC
+    LIMIT 10
+""").bindparams(_USER_ID_PARAM)
+
+GET_HISTORY_SQL = text("""
+    SELECT
+        id,
+        input_text,
+        risk,
+        score,
+        reasons,
+        scan_type,
+        created_at
+    FROM scan_history
+    WHERE id = CAST(:id AS uuid)
+      AND user_id = :user_id
+""").bindparams(_USER_ID_PARAM)
+
+DELETE_HISTORY_SQL = text("""
+    DELETE FROM scan_history
+    WHERE id = CAST(:id AS uuid)
+      AND user_id = :user_id
+""").bindparams(_USER_ID_PARAM)
+
 
 # ---------- MODELS ----------
 class HistoryItem(BaseModel):
@@ -36,35 +96,18 @@ def list_history(
     current_user: User = Depends(get_current_user),
 ):
     rows = db.execute(
-        text("""
-            SELECT
-                id,
-                input_text,
-                risk,
-                score,
-                reasons,
-                scan_type,
-                created_at
-            FROM scan_history
-            WHERE user_id = CAST(:user_id AS uuid)
-            ORDER BY created_at DESC
-            LIMIT :limit OFFSET :offset
-        """),
+        LIST_HISTORY_SQL,
         {
-            "user_id": str(current_user.id),
+            "user_id": current_user.id,
             "limit": limit,
             "offset": offset,
         },
     ).mappings().all()
 
     count = db.execute(
-        text("""
-            SELECT COUNT(*)
-            FROM scan_history
-            WHERE user_id = CAST(:user_id AS uuid)
-        """),
+        COUNT_HISTORY_SQL,
         {
-            "user_id": str(current_user.id),
+            "user_id": current_user.id,
         },
     ).scalar()
 
@@ -87,19 +130,8 @@ def debug_scans(
     current_user: User = Depends(get_current_user),
 ):
     rows = db.execute(
-        text("""
-            SELECT
-                id,
-                scan_type,
-                risk,
-                score,
-                created_at
-            FROM scan_history
-            WHERE user_id = CAST(:user_id AS uuid)
-            ORDER BY created_at DESC
-            LIMIT 10
-        """),
-        {"user_id": str(current_user.id)},
+        DEBUG_SCANS_SQL,
+        {"user_id": current_user.id},
     ).mappings().all()
 
     return {
@@ -119,22 +151,10 @@ def get_history(
     current_user: User = Depends(get_current_user),
 ):
     row = db.execute(
-        text("""
-            SELECT
-                id,
-                input_text,
-                risk,
-                score,
-                reasons,
-                scan_type,
-                created_at
-            FROM scan_history
-            WHERE id = CAST(:id AS uuid)
-              AND user_id = CAST(:user_id AS uuid)
-        """),
+        GET_HISTORY_SQL,
         {
             "id": history_id,
-            "user_id": str(current_user.id),
+            "user_id": current_user.id,
         },
     ).mappings().first()
 
@@ -154,14 +174,10 @@ def delete_history(
     current_user: User = Depends(get_current_user),
 ):
     result = db.execute(
-        text("""
-            DELETE FROM scan_history
-            WHERE id = CAST(:id AS uuid)
-              AND user_id = CAST(:user_id AS uuid)
-        """),
+        DELETE_HISTORY_SQL,
         {
             "id": history_id,
-            "user_id": str(current_user.id),
+            "user_id": current_user.id,
         },
     )
 
@@ -170,4 +186,7 @@ def delete_history(
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="History not found")
 
+    # /risk/insights caches keyword counts over this user's history
+    invalidate_keyword_counts(str(current_user.id))
+
     return {"status": "deleted"}
@@ -1,6 +1,7 @@
 from collections import Counter
 
 from fastapi import APIRouter, Depends
+from redis.exceptions import RedisError
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -8,6 +9,11 @@ from app.core.features import Feature
 from app.db import get_db
 from app.dependencies.access import require_feature
 from app.models.user import User
+from app.services.redis_store import get_json, set_json
+from app.services.scan_history import (
+    KEYWORD_COUNTS_CACHE_NAMESPACE,
+    KEYWORD_COUNTS_CACHE_TTL_SECONDS,
+)
 
 router = APIRouter(prefix="/risk", tags=["Risk Insights"])
 
@@ -16,6 +22,25 @@ SUSPICIOUS_KEYWORDS = [
     "job", "offer", "kyc", "payment", "verify"
 ]
 
+# One row of per-keyword hit counts, computed in Postgres so scan texts
+# never leave the database. input_text_lower is lower(input_text) filled at
+# write time, so strpos on it mirrors a Python substring test without
+# re-lowercasing; rows the migration backfill has not reached yet fall back
+# to lowering inline.
+KEYWORD_COUNTS_SQL = text(
+    "SELECT "
+    + ", ".join(
+        f"COUNT(*) FILTER (WHERE strpos(coalesce(input_text_lower, lower(input_text)), :kw_{i}) > 0) AS kw_{i}"
+        for i in range(len(SUSPICIOUS_KEYWORDS))
+    )
+    + """
+    FROM scan_history
+    WHERE user_id = CAST(:uid AS uuid)
+      AND created_at >= NOW() - INTERVAL '30 days'
+    """
+)
+_KEYWORD_PARAMS = {f"kw_{i}": keyword for i, keyword in enumerate(SUSPICIOUS_KEYWORDS)}
+
 
 @router.get("/insights")
 def paid_risk_insights(
@@ -54,27 +79,7 @@ def paid_risk_insights(
         reverse=True,
     )[:3]
 
-    texts = db.execute(
-        text(
-            """
-            SELECT input_text
-            FROM scan_history
-            WHERE user_id = CAST(:uid AS uuid)
-              AND created_at >= NOW() - INTERVAL '30 days'
-        """
-        ),
-        {"uid": str(current_user.id)},
-    ).scalars().all()
-
-    keyword_hits = Counter()
-
-    for text_value in texts:
-        if not text_value:
-            continue
-        lowered = text_value.lower()
-        for keyword in SUSPICIOUS_KEYWORDS:
-            if keyword in lowered:
-                keyword_hits[keyword] += 1
+    keyword_hits = Counter(_keyword_counts(db, str(current_user.id)))
 
     top_keywords = keyword_hits.most_common(5)
 
@@ -114,3 +119,31 @@ def paid_risk_insights(
         },
         "recommendations": recommendations,
     }
+
+
+def _keyword_counts(db: Session, user_id: str) -> dict[str, int]:
+    """Non-zero keyword hit counts, cached briefly per user in Redis."""
+    # The cache is optional: a Redis outage or a missing REDIS_URL
+    # (RuntimeError) just means the aggregate is read from Postgres.
+    try:
+        cached = get_json(KEYWORD_COUNTS_CACHE_NAMESPACE, user_id)
+    except (RedisError, RuntimeError):
+        cached = None
+    if cached is not None:
+        return cached
+
+    counts = db.execute(
+        KEYWORD_COUNTS_SQL,
+        {"uid": user_id, **_KEYWORD_PARAMS},
+    ).one()
+    hits = {
+        keyword: int(count)
+        for keyword, count in zip(SUSPICIOUS_KEYWORDS, counts)
+        if count
+    }
+
+    try:
+        set_json(KEYWORD_COUNTS_CACHE_NAMESPACE, hits, KEYWORD_COUNTS_CACHE_TTL_SECONDS, user_id)
+    except (RedisError, RuntimeError):
+        pass
+    return hits
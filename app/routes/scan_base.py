@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from fastapi import Depends, HTTPException
 
 from app.core.features import TIER_FREE, TIER_PRO, TIER_ULTRA, normalize_plan
+from app.core.ids import uuid7
 from app.routes.auth import get_current_user
 from redis.exceptions import RedisError
 
@@ -84,7 +85,9 @@ def require_user(user=Depends(get_current_user)):
 
 
 def generate_scan_id() -> uuid.UUID:
-    return uuid.uuid4()
+    # Becomes scan_history.id; time-ordered so inserts stay on the
+    # rightmost primary-key leaf pages.
+    return uuid7()
 
 
 def build_scan_error(error: str, message: str) -> dict:
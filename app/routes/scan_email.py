@@ -1,10 +1,8 @@
-import json
 import logging
 import hashlib
 import unicodedata
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from email_validator import EmailNotValidError, validate_email
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.features import Feature, has_feature, normalize_plan
@@ -19,8 +17,9 @@ from app.schemas.scan_email import EmailScanRequest
 from app.services.email import email_analyzer
 from app.services.response_builder import build_scan_response
 from app.services.safe_response import safe_scan_response
+from app.services.scan_history import save_scan_history
 from app.services.scan_logger import log_scan_event
-from app.services.security_alerts import try_create_scan_alert
+from app.services.security_alerts import create_scan_alert_in_background
 from app.enums.scan_type import ScanType
 
 router = APIRouter(prefix="/scan", tags=["Scan"])
@@ -31,6 +30,7 @@ logger = logging.getLogger(__name__)
 def scan_email(
     payload: EmailScanRequest,
     request: Request,
+    background_tasks: BackgroundTasks,
     current_user=Depends(require_user),
     db: Session = Depends(get_db),
 ):
@@ -92,51 +92,23 @@ def scan_email(
             plan=plan,
         )
 
-        # ── Persist to scan_history ────────────────────────────────────────
-        try:
-            db.execute(
-                text(
-                    """
-                    INSERT INTO scan_history (
-                        id, user_id, input_text, risk, score, reasons, scan_type, created_at
-                    )
-                    VALUES (
-                        CAST(:id AS uuid), CAST(:user_id AS uuid),
-                        :input_text, :risk, :score, CAST(:reasons AS jsonb), :scan_type, now()
-                    )
-                    ON CONFLICT (id) DO NOTHING
-                    """
-                ),
-                {
-                    "id": scan_id,
-                    "user_id": str(current_user.id),
-                    "input_text": normalized,
-                    "risk": str(result["risk_level"]).lower(),
-                    "score": int(result["risk_score"]),
-                    "reasons": json.dumps(result["reasons"]),
-                    "scan_type": ScanType.EMAIL.value.lower(),
-                },
-            )
-            db.commit()
-            logger.info(
-                "scan_saved",
-                extra={"user_id": str(current_user.id), "scan_type": ScanType.EMAIL.value},
-            )
-        except Exception as e:
-            logger.exception(
-                "scan_save_failed",
-                extra={
-                    "error": str(e),
-                    "endpoint": "/scan/email",
-                    "user_id": str(current_user.id),
-                },
-            )
-            # DB write failure must NOT break the scan response
+        # ── Persist to scan_history (after the response is sent) ──────────
+        background_tasks.add_task(
+            save_scan_history,
+            scan_id=scan_id,
+            user_id=str(current_user.id),
+            input_text=normalized,
+            risk=str(result["risk_level"]).lower(),
+            score=int(result["risk_score"]),
+            reasons=result["reasons"],
+            scan_type=ScanType.EMAIL.value.lower(),
+            endpoint="/scan/email",
+        )
 
         # Create alert for MEDIUM / HIGH risk — never breaks scan (safe helper)
-        try_create_scan_alert(
-            db,
-            user=current_user,
+        background_tasks.add_task(
+            create_scan_alert_in_background,
+            user_id=current_user.id,
             client_ip=client_ip,
             risk_score=int(result["risk_score"]),
             analysis_type="EMAIL",
@@ -54,7 +54,8 @@ import logging
 import math
 import re
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image, ImageFilter, ImageStat
 from pydantic import BaseModel
 
@@ -66,7 +67,7 @@ from app.services.plan_limits import LimitType, enforce_limit
 from app.services.redis_store import allow_daily_limit, get_redis
 from app.services.risk_mapper import derive_risk_level_from_score
 from app.services.safe_response import safe_scan_response
-from app.services.security_alerts import try_create_scan_alert
+from app.services.security_alerts import create_scan_alert_in_background
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/scan", tags=["Scan"])
@@ -77,6 +78,7 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 _ALLOWED_MIMES: frozenset[str] = frozenset({"image/png", "image/jpeg", "image/webp"})
 _MAX_FILE_BYTES: int = 10 * 1024 * 1024  # 10 MB
+_READ_CHUNK_BYTES: int = 64 * 1024
 
 # Known AI / generative-tool software strings (EXIF tag 305).
 _AI_SOFTWARE_KEYWORDS: frozenset[str] = frozenset({
@@ -287,6 +289,23 @@ def _confidence_label(detection_confidence: float) -> str:
     return "Low"
 
 
+# ---------------------------------------------------------------------------
+# Upload handling
+# ---------------------------------------------------------------------------
+
+async def _read_upload_limited(file: UploadFile) -> bytes:
+    """Read the upload in chunks, rejecting it as soon as it passes the size cap."""
+    buf = bytearray()
+    while True:
+        chunk = await file.read(_READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        buf += chunk
+        if len(buf) > _MAX_FILE_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large (max 10 MB)")
+    return bytes(buf)
+
+
 # ---------------------------------------------------------------------------
 # Detection logic
 # ---------------------------------------------------------------------------
@@ -558,6 +577,7 @@ def _analyze_image(image_bytes: bytes) -> dict:
 
 @router.post("/image")
 async def scan_image(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     request: Request = None,
     current_user=Depends(require_user),
@@ -579,11 +599,9 @@ async def scan_image(
             detail="Only image files are supported (PNG, JPEG, WebP)",
         )
 
-    image_bytes = await file.read()
+    image_bytes = await _read_upload_limited(file)
     if not image_bytes:
         raise HTTPException(status_code=400, detail="Empty file")
-    if len(image_bytes) > _MAX_FILE_BYTES:
-        raise HTTPException(status_code=413, detail="Image too large (max 10 MB)")
 
     # Enforce per-plan rate limits; lifetime counter for FREE is below
     apply_scan_rate_limits(
@@ -602,7 +620,8 @@ async def scan_image(
     enforce_limit(current_user, LimitType.AI_IMAGE_LIFETIME, db=db, endpoint="/scan/image")
 
     try:
-        result = _analyze_image(image_bytes)
+        # PIL decoding / filtering is CPU-bound — keep it off the event loop
+        result = await run_in_threadpool(_analyze_image, image_bytes)
     except HTTPException:
         raise
     except Exception:
@@ -634,9 +653,9 @@ async def scan_image(
     )
 
     # Create alert for MEDIUM (≥40) or HIGH (≥70) risk — safe helper, never raises
-    try_create_scan_alert(
-        db,
-        user=current_user,
+    background_tasks.add_task(
+        create_scan_alert_in_background,
+        user_id=current_user.id,
         client_ip=client_ip,
         risk_score=int(result["risk_score"]),
         analysis_type="IMAGE",
@@ -703,9 +722,12 @@ def _explain_cache_key(risk_level: str, risk_score: int, highlights: list[str])
     return f"explain:image:{hashlib.sha256(raw.encode()).hexdigest()[:24]}"
 
 
+_SIGNAL_CODE_RE = re.compile(r'^[A-Z0-9_]+$')
+
+
 def _clean_highlights(highlights: list[str]) -> list[str]:
     """Return only human-readable highlights — drop raw ALL_CAPS signal codes."""
-    return [h for h in highlights if not re.match(r'^[A-Z0-9_]+$', h.strip()) and len(h.strip()) > 15]
+    return [h for h in highlights if not _SIGNAL_CODE_RE.match(h.strip()) and len(h.strip()) > 15]
 
 
 # ── Opening-phrase pools for the fallback ────────────────────────────────────
@@ -741,6 +763,15 @@ def _fallback_seed(risk_level: str, highlights: list[str]) -> int:
     return int(hashlib.sha256(seed_str.encode()).hexdigest()[:4], 16)
 
 
+# Verdict phrasing per risk level; only the chosen entry is formatted per call.
+_VERDICT_HINTS: dict[str, str] = {
+    "HIGH":   "looks very likely fake — probably made by a computer (score: {score}/100)",
+    "MEDIUM": "has some unusual things — hard to say for sure (score: {score}/100)",
+    "LOW":    "looks like a genuine photo (score: {score}/100)",
+}
+_DEFAULT_VERDICT_HINT = "was checked (score: {score}/100)"
+
+
 def _build_prompt(
     risk_level: str,
     risk_score: int,
@@ -751,11 +782,7 @@ def _build_prompt(
     clean = _clean_highlights(highlights)[:4]
     findings = "; ".join(clean) if clean else "no single clear sign was found"
 
-    verdict_hint = {
-        "HIGH":   f"looks very likely fake — probably made by a computer (score: {risk_score}/100)",
-        "MEDIUM": f"has some unusual things — hard to say for sure (score: {risk_score}/100)",
-        "LOW":    f"looks like a genuine photo (score: {risk_score}/100)",
-    }.get(risk_level.upper(), f"was checked (score: {risk_score}/100)")
+    verdict_hint = _VERDICT_HINTS.get(risk_level.upper(), _DEFAULT_VERDICT_HINT).format(score=risk_score)
 
     if risk_score <= 30:
         tone = "Tone: warm and reassuring. Start positively and put the person at ease."
@@ -861,10 +888,11 @@ async def explain_image(
     prompt = _build_prompt(body.risk_level, body.risk_score, body.highlights, body.recommendation)
 
     try:
-        import openai  # guarded import — keeps startup fast when unused
+        # Awaited on the shared async client so the event loop keeps serving
+        # other requests while the completion is in flight.
+        from app.services.openai_client import get_async_openai  # guarded import — keeps startup fast when unused
 
-        ai_client = openai.OpenAI()  # reads OPENAI_API_KEY from environment
-        response = ai_client.chat.completions.create(
+        response = await get_async_openai().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": _EXPLAIN_SYSTEM},
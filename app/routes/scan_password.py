@@ -1,8 +1,6 @@
-import json
 import uuid
 import logging
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.features import normalize_plan
@@ -13,6 +11,7 @@ from app.schemas.scan_password import PasswordScanRequest
 from app.services.password.password_analyzer import analyze_password
 from app.services.response_builder import build_scan_response
 from app.services.safe_response import safe_scan_response
+from app.services.scan_history import save_scan_history
 from app.services.scan_logger import log_scan_event
 from app.services.secure_now import create_secure_item_for_scan
 
@@ -23,6 +22,7 @@ logger = logging.getLogger(__name__)
 @router.post("/password")
 def scan_password(
     payload: PasswordScanRequest,
+    background_tasks: BackgroundTasks,
     current_user=Depends(require_user),
     db: Session = Depends(get_db),
 ):
@@ -72,46 +72,18 @@ def scan_password(
             plan=plan,
         )
 
-        # ── Persist to scan_history ────────────────────────────────────────
-        try:
-            db.execute(
-                text(
-                    """
-                    INSERT INTO scan_history (
-                        id, user_id, input_text, risk, score, reasons, scan_type, created_at
-                    )
-                    VALUES (
-                        CAST(:id AS uuid), CAST(:user_id AS uuid),
-                        :input_text, :risk, :score, CAST(:reasons AS jsonb), :scan_type, now()
-                    )
-                    ON CONFLICT (id) DO NOTHING
-                    """
-                ),
-                {
-                    "id": scan_id,
-                    "user_id": str(current_user.id),
-                    "input_text": "[password]",  # never store the raw password
-                    "risk": str(result["risk_level"]).lower(),
-                    "score": int(result["risk_score"]),
-                    "reasons": json.dumps(result["reasons"]),
-                    "scan_type": ScanType.PASSWORD.value.lower(),
-                },
-            )
-            db.commit()
-            logger.info(
-                "scan_saved",
-                extra={"user_id": str(current_user.id), "scan_type": ScanType.PASSWORD.value},
-            )
-        except Exception as e:
-            logger.exception(
-                "scan_save_failed",
-                extra={
-                    "error": str(e),
-                    "endpoint": "/scan/password",
-                    "user_id": str(current_user.id),
-                },
-            )
-            # DB write failure must NOT break the scan response
+        # ── Persist to scan_history (after the response is sent) ──────────
+        background_tasks.add_task(
+            save_scan_history,
+            scan_id=scan_id,
+            user_id=str(current_user.id),
+            input_text="[password]",  # never store the raw password
+            risk=str(result["risk_level"]).lower(),
+            score=int(result["risk_score"]),
+            reasons=result["reasons"],
+            scan_type=ScanType.PASSWORD.value.lower(),
+            endpoint="/scan/password",
+        )
 
         if int(result["risk_score"]) >= 70:
             try:
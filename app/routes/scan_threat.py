@@ -1,7 +1,5 @@
 import logging
-import json
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import text
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.core.features import normalize_plan
@@ -14,8 +12,9 @@ from app.services.threat.threat_analyzer import analyze_threat
 from app.services.response_builder import build_scan_response
 from app.services.risk_mapper import derive_risk_level_from_score
 from app.services.safe_response import safe_scan_response
+from app.services.scan_history import save_scan_history
 from app.services.scan_logger import log_scan_event
-from app.services.security_alerts import create_alert_event, dispatch_plan_alerts, try_create_scan_alert
+from app.services.security_alerts import create_alert_event, create_scan_alert_in_background, dispatch_plan_alerts
 from app.enums.scan_type import ScanType
 
 router = APIRouter(prefix="/scan", tags=["Scan"])
@@ -26,6 +25,7 @@ logger = logging.getLogger(__name__)
 def scan_threat(
     payload: ThreatScanRequest,
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user=Depends(require_user),
 ):
@@ -93,37 +93,18 @@ def scan_threat(
             plan=plan,
         )
 
-        try:
-            db.execute(
-                text(
-                    """
-                    INSERT INTO scan_history (
-                        id, user_id, input_text, risk, score, reasons, scan_type, created_at
-                    )
-                    VALUES (
-                        CAST(:id AS uuid), CAST(:user_id AS uuid),
-                        :input_text, :risk, :score, :reasons, :scan_type, now()
-                    )
-                    ON CONFLICT (id) DO NOTHING
-                    """
-                ),
-                {
-                    "id": scan_id,
-                    "user_id": str(current_user.id),
-                    "input_text": raw_text[:1000],
-                    "risk": str(response.risk_level or derive_risk_level_from_score(int(response.risk_score or 0))).lower(),
-                    "score": int(response.risk_score),
-                    "reasons": json.dumps(response.reasons),
-                    "scan_type": ScanType.THREAT.value,
-                },
-            )
-            db.commit()
-        except Exception:
-            logger.exception(
-                "scan_history_write_failed",
-                extra={"endpoint": "/scan/threat", "user_id": str(current_user.id)},
-            )
-            # DB history write failure must NOT break the scan response
+        # Persist to scan_history after the response is sent
+        background_tasks.add_task(
+            save_scan_history,
+            scan_id=scan_id,
+            user_id=str(current_user.id),
+            input_text=raw_text[:1000],
+            risk=str(response.risk_level or derive_risk_level_from_score(int(response.risk_score or 0))).lower(),
+            score=int(response.risk_score),
+            reasons=response.reasons,
+            scan_type=ScanType.THREAT.value,
+            endpoint="/scan/threat",
+        )
 
         final_payload = response.model_dump(mode="json", exclude_none=True)
         logger.info(
@@ -138,9 +119,9 @@ def scan_threat(
         )
 
         # Create alert for MEDIUM (≥40) or HIGH (≥70) risk — safe helper, never raises
-        try_create_scan_alert(
-            db,
-            user=current_user,
+        background_tasks.add_task(
+            create_scan_alert_in_background,
+            user_id=current_user.id,
             client_ip=client_ip,
             risk_score=int(response.risk_score),
             analysis_type="THREAT",
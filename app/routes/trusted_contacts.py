@@ -331,7 +331,8 @@ def respond_to_invite(
     invite = db.execute(
         text(
             """
-            SELECT *
+            SELECT sender_user_id, receiver_user_id, receiver_phone,
+                   contact_name, relationship, add_to_family, status
             FROM trusted_contact_invites
             WHERE id = CAST(:invite_id AS uuid)
             LIMIT 1
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ExplainScanRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     scan_id: str | None = None
-    text: str | None = None
+    # Same bound as ThreatScanRequest: free text is run through analyze_threat
+    text: str | None = Field(default=None, max_length=2000)
     language: str = "en"
 
 
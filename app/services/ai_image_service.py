@@ -7,7 +7,10 @@ from typing import Dict
 
 from PIL import Image, ImageStat
 import piexif
-from openai import OpenAI
+
+from app.services.openai_client import get_openai
+
+logger = logging.getLogger(__name__)
 
 
 # =========================================================
@@ -80,7 +83,7 @@ def analyze_exif(image_bytes: bytes) -> Dict:
             signals.append("Resolution matches common AI output size")
 
     except Exception as e:
-        logging.warning(f"EXIF analysis error: {e}")
+        logger.warning("EXIF analysis error: %s", e)
 
     return {
         "ai_score": ai_score,
@@ -142,7 +145,7 @@ def analyze_with_ai_vision(image_bytes: bytes) -> Dict:
         }
 
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_openai()
         b64 = base64.b64encode(image_bytes).decode()
 
         prompt = """
@@ -198,7 +201,7 @@ Return strict JSON:
         }
 
     except Exception:
-        logging.exception("Vision analysis failed")
+        logger.exception("Vision analysis failed")
         return {
             "confidence": 50,
             "signals": ["Vision analysis failed"]
@@ -6,9 +6,9 @@ import requests
 from pathlib import Path
 import os
 import json
-from openai import OpenAI
 
 from app.core.features import Feature, has_feature
+from app.services.openai_client import get_openai
 from app.services.breach.manager import check_email_breach, get_breach_provider
 from app.services.pwned_passwords import check_password_pwned
 
@@ -125,6 +125,16 @@ SCAM_KEYWORDS = {
     ]
 }
 
+# Word-bounded patterns compiled once, in SCAM_KEYWORDS order
+_SCAM_KEYWORD_PATTERNS = tuple(
+    (word, re.compile(rf"\b{re.escape(word)}\b"))
+    for keywords in SCAM_KEYWORDS.values()
+    for word in keywords
+)
+_SCAM_KEYWORD_ANY_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(word) for word, _ in _SCAM_KEYWORD_PATTERNS) + r")\b"
+)
+
 # =========================================================
 # FEEDS
 # =========================================================
@@ -160,8 +170,11 @@ def get_domain_age_days(domain: str):
         return None
 
 
+URL_RE = re.compile(r"https?://\S+")
+
+
 def extract_url(text: str):
-    match = re.search(r"(https?://[^\s]+)", text)
+    match = URL_RE.search(text)
     return match.group(0) if match else None
 
 # =========================================================
@@ -173,11 +186,15 @@ def analyze_text_message(text: str):
     score = 0
     text_lower = text.lower()
 
-    for keywords in SCAM_KEYWORDS.values():
-        for word in keywords:
-            if re.search(rf"\b{re.escape(word)}\b", text_lower):
-                reasons.append(f"Scam keyword detected: '{word}'")
-                score += 15
+    # Most messages hit no keyword at all; one alternation pass rules that
+    # out before the per-keyword checks that build the reasons list.
+    if not _SCAM_KEYWORD_ANY_RE.search(text_lower):
+        return {"score": score, "reasons": reasons}
+
+    for word, pattern in _SCAM_KEYWORD_PATTERNS:
+        if pattern.search(text_lower):
+            reasons.append(f"Scam keyword detected: '{word}'")
+            score += 15
 
     return {"score": score, "reasons": reasons}
 
@@ -248,7 +265,7 @@ def ai_deep_scan(content: str):
             "reasons": ["AI analysis unavailable"],
         }
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai()
 
     prompt = f"""
 Analyze the following content and return STRICT JSON.
@@ -1,3 +1,5 @@
+from bisect import bisect_right
+
 # ── Legacy thresholds (300–999 range — used by old monthly batch job) ─────────
 ELITE_SCORE       = 850
 SAFE_SCORE        = 750
@@ -11,19 +13,19 @@ V2_MODERATE_RISK  = 550
 V2_HIGH_RISK      = 400
 
 
+# ── Ascending breakpoints → labels (bisect_right index picks the label) ──────
+_LEVEL_BREAKPOINTS    = (HIGH_RISK_SCORE, MEDIUM_RISK_SCORE, SAFE_SCORE, ELITE_SCORE)
+_LEVEL_LABELS         = ("Critical", "High Risk", "Medium Risk", "Safe", "Elite")
+
+_V2_LEVEL_BREAKPOINTS = (V2_HIGH_RISK, V2_MODERATE_RISK, V2_MOSTLY_SAFE, V2_EXCELLENT)
+_V2_LEVEL_LABELS      = ("CRITICAL", "HIGH_RISK", "MODERATE_RISK", "MOSTLY_SAFE", "EXCELLENT")
+
+
 def get_risk_level(score: int) -> str:
     """Legacy human-readable label (used by monthly job and old client code)."""
-    if score >= ELITE_SCORE:       return "Elite"
-    if score >= SAFE_SCORE:        return "Safe"
-    if score >= MEDIUM_RISK_SCORE: return "Medium Risk"
-    if score >= HIGH_RISK_SCORE:   return "High Risk"
-    return "Critical"
+    return _LEVEL_LABELS[bisect_right(_LEVEL_BREAKPOINTS, score)]
 
 
 def get_risk_level_v2(score: int) -> str:
     """V2 machine-readable level (0–1000 real-time scoring)."""
-    if score >= V2_EXCELLENT:     return "EXCELLENT"
-    if score >= V2_MOSTLY_SAFE:   return "MOSTLY_SAFE"
-    if score >= V2_MODERATE_RISK: return "MODERATE_RISK"
-    if score >= V2_HIGH_RISK:     return "HIGH_RISK"
-    return "CRITICAL"
+    return _V2_LEVEL_LABELS[bisect_right(_V2_LEVEL_BREAKPOINTS, score)]
@@ -21,16 +21,18 @@ from typing import Any
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.services.cyber_card_constants import get_risk_level_v2
+
 logger = logging.getLogger(__name__)
 
 # ── Risk-level thresholds (V2 — 0-1000 scale) ─────────────────────────────────
 
-def _level(score: int) -> str:
-    if score >= 850: return "EXCELLENT"
-    if score >= 700: return "MOSTLY_SAFE"
-    if score >= 550: return "MODERATE_RISK"
-    if score >= 400: return "HIGH_RISK"
-    return "CRITICAL"
+_level = get_risk_level_v2
+
+
+# ── Activity coverage bonus, indexed by distinct scan types covered (4+ = max) ─
+
+_COVERAGE_BONUS: tuple[int, ...] = (0, 20, 40, 70, 100)
 
 
 # ── UTC-aware datetime helper ────────────────────────────────────────────────
@@ -306,12 +308,7 @@ def calculate_cyber_score(db: Session, user_id: str) -> dict[str, Any]:
     if image_scans:    covered.add("image")
 
     coverage_n = len(covered)
-    act_bonus = (
-        100 if coverage_n >= 4 else
-         70 if coverage_n == 3 else
-         40 if coverage_n == 2 else
-         20 if coverage_n == 1 else 0
-    )
+    act_bonus = _COVERAGE_BONUS[min(coverage_n, len(_COVERAGE_BONUS) - 1)]
 
     if coverage_n == 0:
         insights.append(
@@ -0,0 +1,57 @@
+# app/services/llm_cache.py
+
+"""
+Exact-match cache for low-temperature chat completions.
+
+Keyed on the sha256 of model + messages + temperature (via
+redis_store.build_hashed_key), so an identical prompt re-issued by a cron
+job inside its validity window is answered from Redis instead of OpenAI.
+Cache errors never fail the caller: a Redis outage just means a miss.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from app.services.redis_store import get_json, set_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAMESPACE = "cache:llm"
+
+# Only near-deterministic requests are worth replaying verbatim
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+
+def _cache_parts(body: Dict[str, Any]) -> tuple:
+    return (
+        body.get("model"),
+        json.dumps(body.get("messages"), sort_keys=True, ensure_ascii=False),
+        body.get("temperature"),
+    )
+
+
+def is_cacheable(body: Dict[str, Any]) -> bool:
+    temperature = body.get("temperature", 1.0)
+    return temperature is not None and temperature <= MAX_CACHEABLE_TEMPERATURE
+
+
+def get_cached_completion(body: Dict[str, Any]) -> Optional[str]:
+    """Return the cached message content for *body*, or None on a miss."""
+    if not is_cacheable(body):
+        return None
+    try:
+        cached = get_json(CACHE_NAMESPACE, *_cache_parts(body))
+    except Exception as e:
+        logger.warning("LLM cache read failed: %s", e)
+        return None
+    return cached.get("content") if cached else None
+
+
+def set_cached_completion(body: Dict[str, Any], content: str, ttl_seconds: int) -> None:
+    if not is_cacheable(body) or ttl_seconds <= 0:
+        return
+    try:
+        set_json(CACHE_NAMESPACE, {"content": content}, int(ttl_seconds), *_cache_parts(body))
+    except Exception as e:
+        logger.warning("LLM cache write failed: %s", e)
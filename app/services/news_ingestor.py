@@ -1,6 +1,8 @@
 import logging
 import feedparser
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from app.services.supabase_client import get_supabase
@@ -10,6 +12,74 @@ logging.basicConfig(
     format="%(asctime)s | %(levelname)s | %(message)s"
 )
 
+RSS_SOURCES = {
+    "The Hacker News": ("https://feeds.feedburner.com/TheHackersNews", "Cyber"),
+    "SecurityWeek": ("https://www.securityweek.com/rss", "Cyber"),
+    "Help Net Security": ("https://www.helpnetsecurity.com/feed/", "Cyber"),
+    "Security Affairs": ("https://securityaffairs.com/feed", "Cyber"),
+    "WeLiveSecurity": ("https://www.welivesecurity.com/en/rss/feed/", "Cyber"),
+    "Sophos News": ("https://news.sophos.com/en-us/feed/", "Cyber"),
+    "Google Online Security": ("http://feeds.feedburner.com/GoogleOnlineSecurityBlog", "Cyber"),
+
+    "MIT Technology Review": ("https://www.technologyreview.com/feed/", "AI"),
+    "OpenAI Blog": ("https://openai.com/blog/rss/", "AI"),
+    "The Register Security": ("https://www.theregister.com/security/headlines.atom", "Tech"),
+
+    "CERT-In Advisories": ("https://www.cert-in.org.in/rss/all.xml", "Govt"),
+    "CISA Advisories": ("https://www.cisa.gov/cybersecurity-advisories/all.xml", "Govt"),
+    "MeitY Press Releases": ("https://www.meity.gov.in/press-releases/rss.xml", "Govt"),
+    "UIDAI Updates": ("https://uidai.gov.in/rss.xml", "Govt"),
+    "RBI Press Releases": ("https://rbi.org.in/Scripts/Rss.aspx", "Govt"),
+    "PIB Digital India": ("https://pib.gov.in/rss.aspx?ministry_id=31", "Govt"),
+}
+
+# Category -> impact, resolved once per source instead of per entry.
+HIGH_IMPACT_CATEGORIES = frozenset({"Cyber", "Govt"})
+DEFAULT_ACTIONS = "Stay alert. Follow official advisories. Do not click unknown links."
+
+FETCH_WORKERS = 8
+
+
+def _fetch_feed(url):
+    return feedparser.parse(url)
+
+
+def _fetch_all_feeds():
+    """Fetch every RSS source concurrently; returns {source: feed | Exception}."""
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        futures = {
+            source: pool.submit(_fetch_feed, url)
+            for source, (url, _category) in RSS_SOURCES.items()
+        }
+    results = {}
+    for source, future in futures.items():
+        try:
+            results[source] = future.result()
+        except Exception as e:
+            results[source] = e
+    return results
+
+
+def _ingest_rss_worker():
+    try:
+        ingest_rss()
+        logging.info("rss_ingestion_completed")
+    except Exception:
+        logging.exception("rss_ingestion_failed")
+
+
+def ingest_rss_in_background():
+    """
+    Run ingest_rss() on a daemon thread and return immediately, so app
+    startup is not held up behind the RSS fetch burst.
+    """
+    threading.Thread(
+        target=_ingest_rss_worker,
+        name="rss-ingest",
+        daemon=True,          # thread does not block process shutdown
+    ).start()
+
+
 def ingest_rss():
     logging.info("🚀 RSS ingestion started")
 
@@ -26,32 +96,18 @@ def ingest_rss():
         logging.error("Supabase client is None")
         return
 
-    RSS_SOURCES = {
-        "The Hacker News": ("https://feeds.feedburner.com/TheHackersNews", "Cyber"),
-        "SecurityWeek": ("https://www.securityweek.com/rss", "Cyber"),
-        "Help Net Security": ("https://www.helpnetsecurity.com/feed/", "Cyber"),
-        "Security Affairs": ("https://securityaffairs.com/feed", "Cyber"),
-        "WeLiveSecurity": ("https://www.welivesecurity.com/en/rss/feed/", "Cyber"),
-        "Sophos News": ("https://news.sophos.com/en-us/feed/", "Cyber"),
-        "Google Online Security": ("http://feeds.feedburner.com/GoogleOnlineSecurityBlog", "Cyber"),
-
-        "MIT Technology Review": ("https://www.technologyreview.com/feed/", "AI"),
-        "OpenAI Blog": ("https://openai.com/blog/rss/", "AI"),
-        "The Register Security": ("https://www.theregister.com/security/headlines.atom", "Tech"),
-
-        "CERT-In Advisories": ("https://www.cert-in.org.in/rss/all.xml", "Govt"),
-        "CISA Advisories": ("https://www.cisa.gov/cybersecurity-advisories/all.xml", "Govt"),
-        "MeitY Press Releases": ("https://www.meity.gov.in/press-releases/rss.xml", "Govt"),
-        "UIDAI Updates": ("https://uidai.gov.in/rss.xml", "Govt"),
-        "RBI Press Releases": ("https://rbi.org.in/Scripts/Rss.aspx", "Govt"),
-        "PIB Digital India": ("https://pib.gov.in/rss.aspx?ministry_id=31", "Govt"),
-    }
+    feeds = _fetch_all_feeds()
 
-    inserted = 0
+    # Keyed by fingerprint so an article syndicated by several feeds (or
+    # repeated within one) is only looked up and inserted once per run.
+    candidates = {}
 
     for source, (url, category) in RSS_SOURCES.items():
+        impact = "HIGH" if category in HIGH_IMPACT_CATEGORIES else "MEDIUM"
         try:
-            feed = feedparser.parse(url)
+            feed = feeds[source]
+            if isinstance(feed, Exception):
+                raise feed
 
             if not feed.entries:
                 logging.warning(f"No entries from {source}")
@@ -73,35 +129,47 @@ def ingest_rss():
                     (title + link).encode("utf-8")
                 ).hexdigest()
 
-                exists = (
-                    supabase
-                    .table("news")
-                    .select("id")
-                    .eq("fingerprint", fingerprint)
-                    .execute()
-                )
-
-                if exists.data:
+                if fingerprint in candidates:
                     continue
 
-                impact = "HIGH" if category in ["Cyber", "Govt"] else "MEDIUM"
-                actions = "Stay alert. Follow official advisories. Do not click unknown links."
-
-                supabase.table("news").insert({
+                candidates[fingerprint] = {
                     "source": source,
                     "category": category,
                     "headline": title,
                     "matter": summary,
                     "impact": impact,
-                    "actions": actions,
+                    "actions": DEFAULT_ACTIONS,
                     "fingerprint": fingerprint,
                     "published_at": datetime.utcnow().isoformat(),
-                }).execute()
-
-                inserted += 1
+                }
 
         except Exception as e:
             logging.error(f"RSS failed for {source}: {e}")
             continue
 
+    inserted = 0
+    if candidates:
+        try:
+            inserted = _insert_new_news(supabase, candidates)
+        except Exception as e:
+            logging.error(f"RSS insert failed: {e}")
+
     logging.info(f"✅ RSS ingestion completed | inserted={inserted}")
+
+
+def _insert_new_news(supabase, candidates):
+    """
+    Bulk insert for the whole run; rows whose fingerprint is already stored
+    are skipped by ON CONFLICT against ux_news_fingerprint.
+    """
+    result = (
+        supabase
+        .table("news")
+        .upsert(
+            list(candidates.values()),
+            on_conflict="fingerprint",
+            ignore_duplicates=True,
+        )
+        .execute()
+    )
+    return len(result.data or [])
@@ -0,0 +1,69 @@
+# app/services/news_job_claims.py
+
+"""
+Claim / settle helpers for the news summary and translation cron jobs.
+
+Rows are claimed through the claim_pending_news RPC (FOR UPDATE SKIP LOCKED
+plus a lease in news_job_claims), so overlapping runs never pay for the same
+row twice. After writing results, a job settles its claims: written rows are
+marked done, everything else failed so it is retried after a backoff.
+
+Batch-API runs attach the OpenAI batch id to their claims instead of waiting
+for it; a later run lists the outstanding batches and settles each one once
+its results are in.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from app.services.supabase_client import get_supabase
+
+
+def claim_pending_news(job: str, limit: int, lease_seconds: Optional[int] = None) -> List[Dict]:
+    """
+    Claim up to *limit* pending rows for *job*. lease_seconds overrides the
+    RPC's default lease; it must cover however long the run holds the rows.
+    """
+    params = {"p_job": job, "p_limit": limit}
+    if lease_seconds is not None:
+        params["p_lease_seconds"] = lease_seconds
+    res = get_supabase().rpc("claim_pending_news", params).execute()
+    return res.data or []
+
+
+def attach_news_batch(job: str, claimed_ids: Iterable, batch_id: str) -> None:
+    get_supabase().rpc(
+        "attach_news_batch",
+        {
+            "p_job": job,
+            "p_ids": sorted(str(news_id) for news_id in claimed_ids),
+            "p_batch_id": batch_id,
+        },
+    ).execute()
+
+
+def outstanding_news_batches(job: str) -> Dict[str, List[str]]:
+    """Return {batch_id: [news_id, ...]} for batches not yet settled."""
+    res = get_supabase().rpc("outstanding_news_batches", {"p_job": job}).execute()
+    return {row["batch_id"]: list(row["news_ids"] or []) for row in res.data or []}
+
+
+def finish_news_claims(
+    job: str,
+    claimed_ids: Iterable,
+    done_ids: Iterable,
+    batch_id: Optional[str] = None,
+) -> None:
+    """
+    Settle a run's claims. With *batch_id*, only rows still owned by that
+    batch are touched.
+    """
+    done = {str(news_id) for news_id in done_ids}
+    failed = sorted({str(news_id) for news_id in claimed_ids} - done)
+
+    if not done and not failed:
+        return
+
+    params = {"p_job": job, "p_done_ids": sorted(done), "p_failed_ids": failed}
+    if batch_id is not None:
+        params["p_batch_id"] = batch_id
+    get_supabase().rpc("finish_news_claims", params).execute()
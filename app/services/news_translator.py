@@ -1,9 +1,10 @@
 import json
-import os
 from typing import List, Dict
-from openai import OpenAI
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from app.services.openai_client import JOB_MAX_RETRIES, get_openai
+
+# Only used by the translation cron job, so it gets the job retry budget
+client = get_openai().with_options(max_retries=JOB_MAX_RETRIES)
 
 SUPPORTED_LANGS = {
     "te": "Telugu",
@@ -11,25 +12,11 @@ SUPPORTED_LANGS = {
 }
 
 
-def translate_batch(
+def build_translation_request(
     items: List[Dict[str, str]],
     lang_code: str,
-) -> List[Dict[str, str]]:
-    """
-    items = [
-        {"id": "...", "headline": "...", "matter": "..."},
-        ...
-    ]
-
-    returns:
-    [
-        {"id": "...", "headline": "...", "matter": "..."},
-        ...
-    ]
-    """
-
-    if not items:
-        return []
+) -> Dict:
+    """Build the chat.completions request body translating *items*."""
 
     language = SUPPORTED_LANGS.get(lang_code)
     if not language:
@@ -68,34 +55,62 @@ Input:
 {json.dumps(payload, ensure_ascii=False)}
 """
 
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a professional news translator."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-        )
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": "You are a professional news translator."},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,
+    }
+
+
+def parse_translation_response(raw: str) -> List[Dict[str, str]]:
+    raw = raw.strip()
+
+    # 🔒 ROBUST JSON EXTRACTION (CRITICAL FIX)
+    start = raw.find("[")
+    end = raw.rfind("]") + 1
 
-        raw = resp.choices[0].message.content.strip()
+    if start == -1 or end == -1:
+        raise ValueError("No valid JSON array found in model response")
 
-        # 🔒 ROBUST JSON EXTRACTION (CRITICAL FIX)
-        start = raw.find("[")
-        end = raw.rfind("]") + 1
+    clean_json = raw[start:end]
 
-        if start == -1 or end == -1:
-            raise ValueError("No valid JSON array found in model response")
+    parsed = json.loads(clean_json)
 
-        clean_json = raw[start:end]
+    # 🔒 SAFETY CHECK
+    if not isinstance(parsed, list):
+        raise ValueError("Parsed JSON is not a list")
 
-        parsed = json.loads(clean_json)
+    return parsed
 
-        # 🔒 SAFETY CHECK
-        if not isinstance(parsed, list):
-            raise ValueError("Parsed JSON is not a list")
 
-        return parsed
+def translate_batch(
+    items: List[Dict[str, str]],
+    lang_code: str,
+) -> List[Dict[str, str]]:
+    """
+    items = [
+        {"id": "...", "headline": "...", "matter": "..."},
+        ...
+    ]
+
+    returns:
+    [
+        {"id": "...", "headline": "...", "matter": "..."},
+        ...
+    ]
+    """
+
+    if not items:
+        return []
+
+    body = build_translation_request(items, lang_code)
+
+    try:
+        resp = client.chat.completions.create(**body)
+        return parse_translation_response(resp.choices[0].message.content)
 
     except Exception as e:
         print(f"❌ Translation failed for {lang_code}: {e}")
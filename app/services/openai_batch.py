@@ -0,0 +1,93 @@
+"""
+OpenAI Batch API helpers for the news cron jobs.
+
+Batch requests are billed at half price and use a separate rate-limit
+pool, at the cost of up to 24h turnaround. Only jobs whose output is not
+time-critical should use this path; it is opt-in via OPENAI_USE_BATCH_API.
+Jobs submit a batch on one cron run and collect it with
+fetch_batch_results() on a later one; nothing here blocks on a batch.
+"""
+
+import io
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+COMPLETION_WINDOW_SECONDS = 24 * 60 * 60
+# news_job_claims lease for rows sent through a batch: the whole completion
+# window plus a margin, so no later run re-claims (and re-bills) them while
+# the batch is still outstanding and waiting to be collected.
+BATCH_CLAIM_LEASE_SECONDS = COMPLETION_WINDOW_SECONDS + 60 * 60
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def batch_api_enabled() -> bool:
+    return (os.getenv("OPENAI_USE_BATCH_API") or "false").strip().lower() == "true"
+
+
+def submit_batch(client: OpenAI, requests: List[Dict]) -> str:
+    """
+    requests = [{"custom_id": "...", "body": {<chat.completions.create kwargs>}}, ...]
+
+    Uploads the requests as JSONL and returns the batch id.
+    """
+    lines = [
+        json.dumps(
+            {
+                "custom_id": req["custom_id"],
+                "method": "POST",
+                "url": CHAT_COMPLETIONS_ENDPOINT,
+                "body": req["body"],
+            },
+            ensure_ascii=False,
+        )
+        for req in requests
+    ]
+    payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    input_file = client.files.create(file=("batch.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=CHAT_COMPLETIONS_ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+    )
+    logger.info("openai_batch_submitted", extra={"batch_id": batch.id, "requests": len(requests)})
+    return batch.id
+
+
+def fetch_batch_results(client: OpenAI, batch_id: str) -> Optional[Dict[str, str]]:
+    """
+    Check a submitted batch once, without waiting.
+
+    Returns None while the batch is still running, otherwise
+    {custom_id: message content}; requests that errored are omitted, and a
+    batch that failed, expired or was cancelled yields {}.
+    """
+    batch = client.batches.retrieve(batch_id)
+    if batch.status not in TERMINAL_STATUSES:
+        return None
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error("openai_batch_unsuccessful", extra={"batch_id": batch_id, "status": batch.status})
+        return {}
+
+    results: Dict[str, str] = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            logger.warning("openai_batch_request_failed", extra={"custom_id": item.get("custom_id")})
+            continue
+        choices = (response.get("body") or {}).get("choices") or []
+        if choices:
+            results[item["custom_id"]] = choices[0]["message"]["content"]
+    return results
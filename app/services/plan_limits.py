@@ -21,6 +21,8 @@ from app.services.redis_store import (
 )
 from app.services.upgrade import build_upgrade_response
 
+logger = logging.getLogger(__name__)
+
 
 class LimitType(str, Enum):
     THREAT_DAILY = "THREAT_DAILY"
@@ -167,7 +169,7 @@ def enforce_limit(
                 reason="limit_cooldown_active",
             )
     except RedisError:
-        logging.exception("Redis plan limit cooldown check failed for %s", resolved.value)
+        logger.exception("Redis plan limit cooldown check failed for %s", resolved.value)
         raise HTTPException(status_code=503, detail="Rate limiter unavailable")
 
     if resolved == LimitType.AI_IMAGE_LIFETIME:
@@ -191,7 +193,7 @@ def enforce_limit(
             try:
                 acquire_cooldown("plan-limit:cooldown", _EXCEEDED_COOLDOWN_SECONDS, user_id, cooldown_key_part)
             except RedisError:
-                logging.exception("Redis plan limit cooldown set failed for %s", resolved.value)
+                logger.exception("Redis plan limit cooldown set failed for %s", resolved.value)
                 raise HTTPException(status_code=503, detail="Rate limiter unavailable")
             _raise_plan_limit_exceeded(
                 user,
@@ -217,14 +219,14 @@ def enforce_limit(
         else:
             raise RuntimeError(f"Unsupported limit window: {config['window']}")
     except RedisError:
-        logging.exception("Redis plan limit check failed for %s", resolved.value)
+        logger.exception("Redis plan limit check failed for %s", resolved.value)
         raise HTTPException(status_code=503, detail="Rate limiter unavailable")
 
     if not allowed:
         try:
             acquire_cooldown("plan-limit:cooldown", _EXCEEDED_COOLDOWN_SECONDS, user_id, cooldown_key_part)
         except RedisError:
-            logging.exception("Redis plan limit cooldown set failed for %s", resolved.value)
+            logger.exception("Redis plan limit cooldown set failed for %s", resolved.value)
             raise HTTPException(status_code=503, detail="Rate limiter unavailable")
         _raise_plan_limit_exceeded(
             user,
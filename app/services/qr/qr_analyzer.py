@@ -12,11 +12,15 @@ from app.services.qr_validators import (
 )
 from app.services.risk_mapper import map_probability_to_risk
 
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+# Lure words in plain-text QR payloads, matched against the lowered text
+_TEXT_LURE_WORDS = ("refund", "support", "kyc", "bonus")
+
 
 def _normalize_payload(payload: str) -> str:
     normalized = unicodedata.normalize("NFKC", payload).strip()
     # strip control characters
-    normalized = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", normalized)
+    normalized = _CONTROL_CHARS_RE.sub("", normalized)
     return normalized
 
 
@@ -47,7 +51,7 @@ def analyze_qr(raw_payload: str) -> dict:
         if contains_zero_width(payload) or is_mixed_script(payload):
             reasons.append("Obfuscated text detected")
             probability = max(probability, 0.5)
-        if any(word in txt for word in ["refund", "support", "kyc", "bonus"]):
+        if any(word in txt for word in _TEXT_LURE_WORDS):
             probability = max(probability, 0.5)
 
     risk = map_probability_to_risk(probability)
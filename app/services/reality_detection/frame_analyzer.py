@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from .risk_scoring import DetectionLayer
 
-try:
-    import cv2
-except Exception:  # pragma: no cover - optional dependency
-    cv2 = None
+
+@lru_cache(maxsize=1)
+def _load_cv2():
+    # Imported on first video scan rather than at app boot: cv2 is slow to load.
+    try:
+        import cv2
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return cv2
 
 
 @dataclass
@@ -20,6 +26,7 @@ class FrameAnalysisResult:
 
 
 def analyze_video_frames(path: str, fast_mode: bool = False) -> FrameAnalysisResult:
+    cv2 = _load_cv2()
     if cv2 is None:
         return FrameAnalysisResult(
             frames_sampled=0,
@@ -2,14 +2,20 @@ from __future__ import annotations
 
 import audioop
 import wave
+from functools import lru_cache
 
 from .engine import RealityDetectionBadRequest
 from .risk_scoring import DetectionLayer
 
-try:
-    import librosa
-except Exception:  # pragma: no cover - optional dependency
-    librosa = None
+
+@lru_cache(maxsize=1)
+def _load_librosa():
+    # Imported on first audio scan rather than at app boot: librosa is slow to load.
+    try:
+        import librosa
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return librosa
 
 
 MAX_AUDIO_SECONDS = 60
@@ -30,6 +36,7 @@ def _load_wav_pcm(path: str) -> tuple[bytes, int]:
 
 
 def analyze_audio_spectrum(path: str) -> tuple[DetectionLayer, DetectionLayer, DetectionLayer]:
+    librosa = _load_librosa()
     if librosa is not None:
         signal, sr = librosa.load(path, sr=16000, mono=True)
         duration = len(signal) / float(sr or 16000)
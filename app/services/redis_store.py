@@ -10,11 +10,51 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Iterator
 
 from redis import Redis
+from redis.exceptions import NoScriptError
 
 KEY_PREFIX = "gosuraksha"
 
 _redis_client: Redis | None = None
 
+# Lua bodies are hashed once here and run by EVALSHA, so each limit check
+# sends a 40-byte digest instead of the script; EVAL (which also loads the
+# script) is only needed after a Redis restart or SCRIPT FLUSH.
+_WINDOW_LIMIT_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+if current <= tonumber(ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+_CONSUME_LIMIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local limit = tonumber(ARGV[2])
+if current >= limit then
+    return {0, current}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {1, current}
+"""
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_SCRIPT_SHAS = {
+    script: hashlib.sha1(script.encode("utf-8")).hexdigest()
+    for script in (_WINDOW_LIMIT_SCRIPT, _CONSUME_LIMIT_SCRIPT, _RELEASE_LOCK_SCRIPT)
+}
+
 
 def _require_redis_url() -> str:
     redis_url = os.getenv("REDIS_URL")
@@ -26,30 +66,42 @@ def _require_redis_url() -> str:
 def get_redis() -> Redis:
     global _redis_client
     if _redis_client is None:
-        _redis_client = Redis.from_url(_require_redis_url(), decode_responses=True, socket_connect_timeout=2, socket_timeout=2)
+        _redis_client = Redis.from_url(
+            _require_redis_url(),
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+        )
     return _redis_client
 
 
+def _run_script(redis: Redis, script: str, key: str, *args: Any) -> Any:
+    try:
+        return redis.evalsha(_SCRIPT_SHAS[script], 1, key, *args)
+    except NoScriptError:
+        return redis.eval(script, 1, key, *args)
+
+
 def build_hashed_key(namespace: str, *parts: Any) -> str:
     payload = "|".join(str(part) for part in parts)
     digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
     return f"{KEY_PREFIX}:{namespace}:{digest}"
 
 
-def _seconds_until_utc_day_end() -> int:
-    now = datetime.now(timezone.utc)
+# Window helpers take the caller's single clock read so the bucket key and
+# its TTL always describe the same instant (no split across midnight).
+def _seconds_until_utc_day_end(now: datetime) -> int:
     day_end = datetime(now.year, now.month, now.day, 23, 59, 59, tzinfo=timezone.utc)
     return max(1, int((day_end - now).total_seconds()) + 1)
 
 
-def _seconds_until_utc_week_end() -> int:
-    now = datetime.now(timezone.utc)
+def _seconds_until_utc_week_end(now: datetime) -> int:
     next_monday = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=7 - now.weekday())
     return max(1, int((next_monday - now).total_seconds()) + 1)
 
 
-def _seconds_until_utc_month_end() -> int:
-    now = datetime.now(timezone.utc)
+def _seconds_until_utc_month_end(now: datetime) -> int:
     if now.month == 12:
         next_month = datetime(year=now.year + 1, month=1, day=1, tzinfo=timezone.utc)
     else:
@@ -59,41 +111,33 @@ def _seconds_until_utc_month_end() -> int:
 
 def _bucket_for_period(period: str) -> tuple[str, int]:
     normalized = str(period).strip().lower()
+    now = datetime.now(timezone.utc)
     if normalized == "day":
-        return datetime.now(timezone.utc).strftime("%Y%m%d"), _seconds_until_utc_day_end()
+        return now.strftime("%Y%m%d"), _seconds_until_utc_day_end(now)
     if normalized == "month":
-        return datetime.now(timezone.utc).strftime("%Y%m"), _seconds_until_utc_month_end()
+        return now.strftime("%Y%m"), _seconds_until_utc_month_end(now)
     raise ValueError(f"Unsupported limit period: {period}")
 
 
 def _allow_window_limit_atomic(key: str, limit: int, ttl_seconds: int) -> bool:
-    redis = get_redis()
-    script = """
-    local current = redis.call('INCR', KEYS[1])
-    if current == 1 then
-        redis.call('EXPIRE', KEYS[1], ARGV[1])
-    end
-    if current <= tonumber(ARGV[2]) then
-        return 1
-    end
-    return 0
-    """
-    allowed = redis.eval(script, 1, key, int(ttl_seconds), int(limit))
+    allowed = _run_script(get_redis(), _WINDOW_LIMIT_SCRIPT, key, int(ttl_seconds), int(limit))
     return int(allowed or 0) == 1
 
 
 def allow_daily_limit(namespace: str, limit: int, *parts: Any) -> bool:
-    return _allow_window_limit_atomic(build_hashed_key(namespace, *parts, datetime.now(timezone.utc).strftime("%Y-%m-%d")), limit, _seconds_until_utc_day_end())
+    now = datetime.now(timezone.utc)
+    return _allow_window_limit_atomic(build_hashed_key(namespace, *parts, now.strftime("%Y-%m-%d")), limit, _seconds_until_utc_day_end(now))
 
 
 def allow_weekly_limit(namespace: str, limit: int, *parts: Any) -> bool:
     now = datetime.now(timezone.utc)
     year, week, _ = now.isocalendar()
-    return _allow_window_limit_atomic(build_hashed_key(namespace, *parts, f"{year}-W{week:02d}"), limit, _seconds_until_utc_week_end())
+    return _allow_window_limit_atomic(build_hashed_key(namespace, *parts, f"{year}-W{week:02d}"), limit, _seconds_until_utc_week_end(now))
 
 
 def allow_monthly_limit(namespace: str, limit: int, *parts: Any) -> bool:
-    return _allow_window_limit_atomic(build_hashed_key(namespace, *parts, datetime.now(timezone.utc).strftime("%Y-%m")), limit, _seconds_until_utc_month_end())
+    now = datetime.now(timezone.utc)
+    return _allow_window_limit_atomic(build_hashed_key(namespace, *parts, now.strftime("%Y-%m")), limit, _seconds_until_utc_month_end(now))
 
 
 def acquire_cooldown(namespace: str, cooldown_seconds: int, *parts: Any) -> bool:
@@ -131,42 +175,16 @@ def consume_sliding_window(namespace: str, limit: int, window_seconds: int, *par
 
 
 def consume_period_limit(namespace: str, limit: int, period: str, *parts: Any) -> tuple[bool, int]:
-    redis = get_redis()
     bucket, ttl_seconds = _bucket_for_period(period)
     key = build_hashed_key(namespace, *parts, bucket)
-    script = """
-    local current = tonumber(redis.call('GET', KEYS[1]) or '0')
-    local limit = tonumber(ARGV[2])
-    if current >= limit then
-        return {0, current}
-    end
-    current = redis.call('INCR', KEYS[1])
-    if current == 1 then
-        redis.call('EXPIRE', KEYS[1], ARGV[1])
-    end
-    return {1, current}
-    """
-    result = redis.eval(script, 1, key, int(ttl_seconds), int(limit))
+    result = _run_script(get_redis(), _CONSUME_LIMIT_SCRIPT, key, int(ttl_seconds), int(limit))
     return bool(int(result[0] or 0)), int(result[1] or 0)
 
 
 def consume_scan_limit(user_id: str, scan_type: str, limit: int, period: str) -> tuple[bool, int]:
-    redis = get_redis()
     bucket, ttl_seconds = _bucket_for_period(period)
     key = f"scan:{user_id}:{scan_type}:{bucket}"
-    script = """
-    local current = tonumber(redis.call('GET', KEYS[1]) or '0')
-    local limit = tonumber(ARGV[2])
-    if current >= limit then
-        return {0, current}
-    end
-    current = redis.call('INCR', KEYS[1])
-    if current == 1 then
-        redis.call('EXPIRE', KEYS[1], ARGV[1])
-    end
-    return {1, current}
-    """
-    result = redis.eval(script, 1, key, int(ttl_seconds), int(limit))
+    result = _run_script(get_redis(), _CONSUME_LIMIT_SCRIPT, key, int(ttl_seconds), int(limit))
     return bool(int(result[0] or 0)), int(result[1] or 0)
 
 
@@ -181,6 +199,10 @@ def set_json(namespace: str, data: dict[str, Any], ttl_seconds: int, *parts: Any
     get_redis().set(build_hashed_key(namespace, *parts), json.dumps(data), ex=ttl_seconds)
 
 
+def delete_json(namespace: str, *parts: Any) -> None:
+    get_redis().delete(build_hashed_key(namespace, *parts))
+
+
 @contextmanager
 def distributed_lock(namespace: str, ttl_seconds: int, *parts: Any) -> Iterator[bool]:
     redis = get_redis()
@@ -192,10 +214,4 @@ def distributed_lock(namespace: str, ttl_seconds: int, *parts: Any) -> Iterator[
     finally:
         if not acquired:
             return
-        script = """
-        if redis.call('GET', KEYS[1]) == ARGV[1] then
-            return redis.call('DEL', KEYS[1])
-        end
-        return 0
-        """
-        redis.eval(script, 1, key, token)
+        _run_script(redis, _RELEASE_LOCK_SCRIPT, key, token)
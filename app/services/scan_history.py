@@ -0,0 +1,287 @@
+import io
+import logging
+import os
+import queue
+import threading
+
+import orjson
+from sqlalchemy import text
+
+from app.core.request_context import REQUEST_ID
+from app.db import SessionLocal, engine
+from app.services.redis_store import delete_json
+
+logger = logging.getLogger(__name__)
+
+INSERT_SCAN_HISTORY_SQL = text(
+    """
+    INSERT INTO scan_history (
+        id, user_id, input_text, risk, score, reasons, scan_type, created_at
+    )
+    VALUES (
+        CAST(:id AS uuid), CAST(:user_id AS uuid),
+        :input_text, :risk, :score, CAST(:reasons AS jsonb), :scan_type, now()
+    )
+    ON CONFLICT (id) DO NOTHING
+    """
+)
+
+# Batches this large go through COPY (no per-row parse/plan) when the
+# driver supports it. COPY has no ON CONFLICT, so a failed COPY falls back
+# to the idempotent INSERT path row by row.
+SCAN_HISTORY_COPY_THRESHOLD = 100
+COPY_SCAN_HISTORY_SQL = (
+    "COPY scan_history ("
+    "id, user_id, input_text, risk, score, reasons, scan_type, created_at"
+    ") FROM STDIN WITH (FORMAT csv)"
+)
+_COPY_SUPPORTED = engine.dialect.driver == "psycopg2"
+# COPY rows take created_at from the same database clock (transaction-start
+# now()) that the INSERT path uses.
+DB_NOW_SQL = text("SELECT now()")
+_COPY_COLUMNS = ("id", "user_id", "input_text", "risk", "score", "reasons", "scan_type")
+
+# Per-user keyword aggregate read by /risk/insights; dropped whenever new
+# history rows for that user are written.
+KEYWORD_COUNTS_CACHE_NAMESPACE = "cache:scan_history_keywords"
+KEYWORD_COUNTS_CACHE_TTL_SECONDS = 60
+
+# Rows are written by one daemon thread in executemany batches. The writer
+# blocks for the first row, then keeps collecting for up to MAX_DELAY or
+# until BATCH_SIZE rows are pending, so an idle server still persists a
+# lone scan within a fraction of a second. The queue is bounded so a stalled
+# database sheds history rows instead of growing the worker's memory.
+SCAN_HISTORY_BATCH_SIZE = int(os.getenv("SCAN_HISTORY_BATCH_SIZE", "500"))
+SCAN_HISTORY_QUEUE_MAX = int(os.getenv("SCAN_HISTORY_QUEUE_MAX", "10000"))
+SCAN_HISTORY_MAX_DELAY_SECONDS = 0.05
+_STOP = object()
+
+_queue: "queue.Queue[dict | object]" = queue.Queue(maxsize=SCAN_HISTORY_QUEUE_MAX)
+_writer: threading.Thread | None = None
+_writer_lock = threading.Lock()
+# Rows shed because the queue was full, since process start
+_dropped_rows = 0
+_dropped_lock = threading.Lock()
+
+
+def save_scan_history(
+    *,
+    scan_id,
+    user_id: str,
+    input_text: str,
+    risk: str,
+    score: int,
+    reasons,
+    scan_type: str,
+    endpoint: str,
+) -> None:
+    """
+    Queue one scan_history row for the batched writer.
+
+    Meant to run as a FastAPI background task after the scan response has
+    been sent, so the audit write never sits on the request's critical path.
+    Failures (including a full queue) are logged and swallowed — history is
+    not part of the response.
+    The originating request id is read from the copied request context.
+    """
+    _ensure_writer()
+    request_id = REQUEST_ID.get()
+    try:
+        _queue.put_nowait(
+            {
+                "id": str(scan_id),
+                "user_id": user_id,
+                "input_text": input_text,
+                "risk": risk,
+                "score": score,
+                "reasons": orjson.dumps(reasons).decode(),
+                "scan_type": scan_type,
+                "endpoint": endpoint,
+                "request_id": request_id,
+            }
+        )
+    except queue.Full:
+        dropped = _record_dropped_row()
+        logger.warning(
+            "scan_history_queue_full",
+            extra={
+                "request_id": request_id,
+                "endpoint": endpoint,
+                "user_id": user_id,
+                "dropped_total": dropped,
+            },
+        )
+
+
+def scan_history_writer_stats() -> dict:
+    """Queue depth and the number of rows dropped on a full queue."""
+    return {"queued": _queue.qsize(), "dropped": _dropped_rows}
+
+
+def _record_dropped_row() -> int:
+    global _dropped_rows
+    with _dropped_lock:
+        _dropped_rows += 1
+        return _dropped_rows
+
+
+def stop_scan_history_writer(timeout: float = 5.0) -> None:
+    """Flush queued rows and stop the writer thread (called on shutdown)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is None:
+        return
+    try:
+        _queue.put(_STOP, timeout=timeout)
+    except queue.Full:
+        logger.warning("scan_history_writer_stop_timeout")
+        return
+    writer.join(timeout)
+
+
+def _ensure_writer() -> None:
+    global _writer
+    if _writer is not None:
+        return
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(
+                target=_writer_loop,
+                name="scan-history-writer",
+                daemon=True,
+            )
+            _writer.start()
+
+
+def _writer_loop() -> None:
+    while True:
+        batch, stopping = _collect_batch()
+        if batch:
+            _write_batch(batch)
+        if stopping:
+            return
+
+
+def _collect_batch() -> tuple[list[dict], bool]:
+    first = _queue.get()
+    if first is _STOP:
+        return _drain(), True
+
+    batch = [first]
+    try:
+        while len(batch) < SCAN_HISTORY_BATCH_SIZE:
+            row = _queue.get(timeout=SCAN_HISTORY_MAX_DELAY_SECONDS)
+            if row is _STOP:
+                return batch + _drain(), True
+            batch.append(row)
+    except queue.Empty:
+        pass
+    return batch, False
+
+
+def _drain() -> list[dict]:
+    rows = []
+    while True:
+        try:
+            row = _queue.get_nowait()
+        except queue.Empty:
+            return rows
+        if row is not _STOP:
+            rows.append(row)
+
+
+def _write_batch(rows: list[dict]) -> None:
+    db = SessionLocal()
+    try:
+        try:
+            if _COPY_SUPPORTED and len(rows) >= SCAN_HISTORY_COPY_THRESHOLD:
+                _copy_batch(db, rows)
+            else:
+                db.execute(INSERT_SCAN_HISTORY_SQL, rows)
+            db.commit()
+        except Exception:
+            # One bad row must not drop the whole batch; retry row by row
+            db.rollback()
+            logger.warning("scan_history_batch_failed", extra={"count": len(rows)})
+            for row in rows:
+                _write_row(db, row)
+        else:
+            for row in rows:
+                _log_saved(row)
+    finally:
+        db.close()
+    _invalidate_keyword_counts({row["user_id"] for row in rows})
+
+
+def _copy_field(value) -> str:
+    # COPY csv reads an unquoted empty field as NULL and a quoted one as ''.
+    # The csv module cannot emit that distinction (QUOTE_NONNUMERIC writes
+    # None as ""), so fields are quoted here by hand.
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_batch(db, rows: list[dict]) -> None:
+    created_at = db.execute(DB_NOW_SQL).scalar().isoformat()
+    buf = io.StringIO()
+    for row in rows:
+        fields = [row[column] for column in _COPY_COLUMNS] + [created_at]
+        buf.write(",".join(_copy_field(value) for value in fields))
+        buf.write("\n")
+    buf.seek(0)
+
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(COPY_SCAN_HISTORY_SQL, buf)
+
+
+def invalidate_keyword_counts(user_id: str) -> bool:
+    """
+    Drop the cached /risk/insights keyword aggregate for *user_id*; call it
+    whenever that user's scan_history rows change. Returns False (after
+    logging) when the cache is unreachable.
+    """
+    try:
+        delete_json(KEYWORD_COUNTS_CACHE_NAMESPACE, user_id)
+    except Exception:
+        logger.warning("scan_history_cache_invalidate_failed", exc_info=True)
+        return False
+    return True
+
+
+def _invalidate_keyword_counts(user_ids: set[str]) -> None:
+    for user_id in user_ids:
+        if not invalidate_keyword_counts(user_id):
+            return
+
+
+def _write_row(db, row: dict) -> None:
+    try:
+        db.execute(INSERT_SCAN_HISTORY_SQL, row)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.exception(
+            "scan_save_failed",
+            extra={
+                "request_id": row["request_id"],
+                "error": str(e),
+                "endpoint": row["endpoint"],
+                "user_id": row["user_id"],
+            },
+        )
+        return
+    _log_saved(row)
+
+
+def _log_saved(row: dict) -> None:
+    logger.info(
+        "scan_saved",
+        extra={
+            "request_id": row["request_id"],
+            "user_id": row["user_id"],
+            "scan_type": row["scan_type"],
+        },
+    )
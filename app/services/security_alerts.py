@@ -6,7 +6,9 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.db import SessionLocal
 from app.models.alert_event import AlertEvent
+from app.models.user import User
 from app.services.alert_logging import log_alert_event
 from app.services.family_alerts import notify_family_head
 from app.services.notification_service import NotificationService, NotificationError
@@ -165,12 +167,7 @@ def try_create_scan_alert(
         logger.warning("try_create_scan_alert: risk_score is None, skipping", extra={"analysis_type": analysis_type})
         return
 
-    # STEP 5: smart severity upgrade from extra signals
-    effective_score = int(risk_score)
-    signals = extra_signals or {}
-    if signals.get("phishing_detected") or signals.get("suspicious_domain"):
-        effective_score = max(effective_score, 70)  # force HIGH
-
+    effective_score = _effective_alert_score(risk_score, extra_signals)
     if effective_score < 40:
         return
 
@@ -225,6 +222,57 @@ def try_create_scan_alert(
         )
 
 
+def create_scan_alert_in_background(
+    *,
+    user_id,
+    client_ip: str | None,
+    risk_score: int,
+    analysis_type: str,
+    scan_id: str | None = None,
+    extra_signals: dict | None = None,
+) -> None:
+    """
+    BackgroundTasks entry point for try_create_scan_alert, so push, trusted
+    and family notification I/O runs after the scan response is sent.
+
+    The request's session is closed by then: this opens its own and reloads
+    the user. Low-risk scans return before touching the database.
+    """
+    if risk_score is None or _effective_alert_score(risk_score, extra_signals) < 40:
+        return
+
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is None:
+            return
+        try_create_scan_alert(
+            db,
+            user=user,
+            client_ip=client_ip,
+            risk_score=risk_score,
+            analysis_type=analysis_type,
+            scan_id=scan_id,
+            extra_signals=extra_signals,
+        )
+    except Exception:
+        logger.exception(
+            "alert_creation_failed",
+            extra={"analysis_type": analysis_type, "risk_score": risk_score, "user_id": str(user_id)},
+        )
+    finally:
+        db.close()
+
+
+def _effective_alert_score(risk_score: int, extra_signals: dict | None) -> int:
+    # STEP 5: smart severity upgrade from extra signals
+    effective_score = int(risk_score)
+    signals = extra_signals or {}
+    if signals.get("phishing_detected") or signals.get("suspicious_domain"):
+        effective_score = max(effective_score, 70)  # force HIGH
+    return effective_score
+
+
 def _risk_level_for_score(risk_score: int) -> str:
     if risk_score >= 70:
         return "high"
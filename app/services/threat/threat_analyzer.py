@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import re
 import unicodedata
+from collections import Counter
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from math import log2
@@ -97,6 +98,27 @@ FINANCIAL_KEYWORDS = ("bank", "upi", "otp")
 SUSPICIOUS_SUFFIXES = (".xyz", ".top", ".click", ".shop", ".live", ".buzz", ".loan", ".monster")
 SHORTENER_HOSTS = {"bit.ly", "tinyurl.com", "tinyurl", "t.co", "goo.gl", "cutt.ly", "ow.ly", "rb.gy", "is.gd", "buff.ly"}
 COMMON_SECOND_LEVEL_SUFFIXES = {"co.in", "org.in", "gov.in", "ac.in", "net.in", "co.uk", "com.au"}
+MESSAGING_APP_RE = re.compile(r"\b(?:whatsapp|telegram)\b", re.IGNORECASE)
+DIRECT_ACTION_RE = re.compile(r"\b(?:pay now|click link|verify account|update account|claim reward|confirm payment)\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"[a-z0-9@._-]+")
+_NON_ALPHA_RE = re.compile(r"[^a-z]")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+# Leetspeak -> letters; "-", "_" and "." are dropped before brand matching.
+_BRAND_TOKEN_TRANSLATION = str.maketrans(
+    {
+        "0": "o",
+        "1": "l",
+        "3": "e",
+        "4": "a",
+        "5": "s",
+        "7": "t",
+        "@": "a",
+        "$": "s",
+        "-": None,
+        "_": None,
+        ".": None,
+    }
+)
 NEW_DOMAIN_DAYS_THRESHOLD = 90
 SAFE_BROWSING_API_URL = "https://safebrowsing.googleapis.com/v4/threatMatches:find"
 
@@ -160,7 +182,7 @@ def analyze_threat(text: str) -> dict:
     lowered = normalized_text.lower()
     urls = _extract_urls(normalized_text)
     signals: list[_Signal] = []
-    category_weights: dict[str, int] = {}
+    category_weights: Counter[str] = Counter()
     hard_floor = 0
     primary_link: _LinkAnalysis | None = None
     suspicious_link_present = False
@@ -176,7 +198,7 @@ def analyze_threat(text: str) -> dict:
                 hard_floor=floor,
             )
             signals.append(signal)
-            category_weights[category] = category_weights.get(category, 0) + signal.weight
+            category_weights[category] += signal.weight
             hard_floor = max(hard_floor, floor)
 
     for category, pattern, weight, why in PATTERN_RULES:
@@ -189,19 +211,19 @@ def analyze_threat(text: str) -> dict:
                 severity="high" if weight >= 25 else "medium",
             )
             signals.append(signal)
-            category_weights[category] = category_weights.get(category, 0) + signal.weight
+            category_weights[category] += signal.weight
 
     for signal in _context_signals(normalized_text, lowered):
         signals.append(signal)
-        category_weights[signal.category] = category_weights.get(signal.category, 0) + signal.weight
+        category_weights[signal.category] += signal.weight
 
     for signal in _intent_signals(lowered):
         signals.append(signal)
-        category_weights[signal.category] = category_weights.get(signal.category, 0) + signal.weight
+        category_weights[signal.category] += signal.weight
 
     for signal in _india_specific_escalations(lowered):
         signals.append(signal)
-        category_weights[signal.category] = category_weights.get(signal.category, 0) + signal.weight
+        category_weights[signal.category] += signal.weight
         hard_floor = max(hard_floor, signal.hard_floor)
 
     for url in urls:
@@ -214,12 +236,12 @@ def analyze_threat(text: str) -> dict:
         )
         for signal in link_analysis.signals:
             signals.append(signal)
-            category_weights[signal.category] = category_weights.get(signal.category, 0) + signal.weight
+            category_weights[signal.category] += signal.weight
             hard_floor = max(hard_floor, signal.hard_floor)
 
     for signal in _intent_link_escalations(lowered, bool(urls), suspicious_link_present):
         signals.append(signal)
-        category_weights[signal.category] = category_weights.get(signal.category, 0) + signal.weight
+        category_weights[signal.category] += signal.weight
         hard_floor = max(hard_floor, signal.hard_floor)
 
     deduped_signals = _rank_signals(_dedupe_signals(signals))
@@ -335,7 +357,7 @@ def _context_signals(text: str, lowered: str) -> list[_Signal]:
             )
         )
 
-    if re.search(r"\b(?:whatsapp|telegram)\b", text, re.IGNORECASE):
+    if MESSAGING_APP_RE.search(text):
         signals.append(
             _Signal(
                 label="Moves the conversation to WhatsApp or Telegram",
@@ -346,7 +368,7 @@ def _context_signals(text: str, lowered: str) -> list[_Signal]:
             )
         )
 
-    if re.search(r"\b(?:pay now|click link|verify account|update account|claim reward|confirm payment)\b", text, re.IGNORECASE):
+    if DIRECT_ACTION_RE.search(text):
         signals.append(
             _Signal(
                 label="Direct call to click, pay, or verify through the message",
@@ -970,23 +992,12 @@ def _mentions_brand(text: str, brand: str) -> bool:
 
 
 def _extract_tokens(text: str) -> list[str]:
-    return re.findall(r"[a-z0-9@._-]+", text.lower())
+    return _TOKEN_RE.findall(text.lower())
 
 
 def _normalize_brand_token(token: str) -> str:
-    replacements = str.maketrans({
-        "0": "o",
-        "1": "l",
-        "3": "e",
-        "4": "a",
-        "5": "s",
-        "7": "t",
-        "@": "a",
-        "$": "s",
-    })
-    normalized = token.lower().translate(replacements)
-    normalized = normalized.replace("-", "").replace("_", "").replace(".", "")
-    return re.sub(r"[^a-z]", "", normalized)
+    normalized = token.lower().translate(_BRAND_TOKEN_TRANSLATION)
+    return _NON_ALPHA_RE.sub("", normalized)
 
 
 def _levenshtein_distance(left: str, right: str) -> int:
@@ -1027,24 +1038,31 @@ def _confidence_label(confidence_score: int) -> str:
     return "LOW"
 
 
+_AGREEING_SIGNAL_PAIRS = (
+    frozenset({"brand_mismatch", "redirect_mismatch"}),
+    frozenset({"brand_mismatch", "phishing_link"}),
+    frozenset({"redirect_mismatch", "phishing_link"}),
+    frozenset({"financial_link_escalation", "phishing_link"}),
+    frozenset({"shortened_link", "phishing_link"}),
+)
+# Sort rank per severity; unknown severities sort last
+_SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
 def _signals_agree(categories: set[str]) -> bool:
-    agreeing_pairs = (
-        {"brand_mismatch", "redirect_mismatch"},
-        {"brand_mismatch", "phishing_link"},
-        {"redirect_mismatch", "phishing_link"},
-        {"financial_link_escalation", "phishing_link"},
-        {"shortened_link", "phishing_link"},
-    )
-    return any(pair.issubset(categories) for pair in agreeing_pairs)
+    return any(pair.issubset(categories) for pair in _AGREEING_SIGNAL_PAIRS)
+
+
+def _signal_sort_key(signal: _Signal) -> tuple[int, int, str]:
+    return (_SEVERITY_RANK.get(signal.severity, 9), -signal.weight, signal.label)
 
 
 def _rank_signals(signals: list[_Signal]) -> list[_Signal]:
-    severity_rank = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    return sorted(signals, key=lambda signal: (severity_rank.get(signal.severity, 9), -signal.weight, signal.label))
+    return sorted(signals, key=_signal_sort_key)
 
 
 def _looks_random_label(label: str) -> bool:
-    cleaned = re.sub(r"[^a-z0-9]", "", label.lower())
+    cleaned = _NON_ALNUM_RE.sub("", label.lower())
     if len(cleaned) < 4:
         return False
     unique_ratio = len(set(cleaned)) / len(cleaned)
@@ -13,9 +13,11 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import requests
+from redis.exceptions import RedisError
 from sqlalchemy import text
 
 from app.db import SessionLocal
+from app.services.redis_store import get_json, set_json
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +31,10 @@ REQUEST_TIMEOUT = 15
 _BATCH_SIZE = 100
 _DATASET_CONFIG = (("bcl", "botnet", 4), ("xbl", "malicious_infrastructure", 5))
 _IP_PATTERN = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
-_GEO_CACHE: dict[str, tuple[float, float] | None] = {}
+# IP -> coordinates lives in Redis so every worker shares one bounded,
+# expiring cache instead of each process growing its own dict.
+GEO_CACHE_NAMESPACE = "cache:threat_geo"
+GEO_CACHE_TTL_SECONDS = 7 * 24 * 3600
 _COUNTRY_CENTROIDS = {
     "US": (37.0902, -95.7129),
     "IN": (20.5937, 78.9629),
@@ -212,8 +217,13 @@ def _extract_ip_addresses(content: bytes) -> list[str]:
 
 
 def _resolve_ip(ip_address: str, *, country_code: str | None = None) -> tuple[float, float] | None:
-    if ip_address in _GEO_CACHE:
-        return _GEO_CACHE[ip_address]
+    try:
+        cached = get_json(GEO_CACHE_NAMESPACE, ip_address)
+    except RedisError:
+        cached = None
+    if cached is not None:
+        coords = cached.get("coords")
+        return tuple(coords) if coords else None
 
     coords: tuple[float, float] | None = None
     try:
@@ -231,7 +241,10 @@ def _resolve_ip(ip_address: str, *, country_code: str | None = None) -> tuple[fl
     if coords is None and country_code:
         coords = _COUNTRY_CENTROIDS.get(str(country_code).upper())
 
-    _GEO_CACHE[ip_address] = coords
+    try:
+        set_json(GEO_CACHE_NAMESPACE, {"coords": coords}, GEO_CACHE_TTL_SECONDS, ip_address)
+    except RedisError:
+        logger.warning("threat_geo_cache_write_failed", exc_info=True)
     return coords
 
 
@@ -0,0 +1,16 @@
+-- Indexes for the per-user alert reads.
+--
+-- home: COUNT(*) FROM alerts WHERE user_id = :uid AND read = false
+--       AND severity = 'HIGH'  -> partial index over unread alerts only.
+-- /alerts, /alerts/refresh: alert_events WHERE user_id = :uid
+--       ORDER BY created_at DESC LIMIT n / created_at > now() - 5 min
+--       -> index-order scan instead of sorting every event for the user.
+--
+-- CONCURRENTLY cannot run inside a transaction block: run each statement
+-- on its own (not wrapped in BEGIN/COMMIT).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alerts_user_unread_severity
+    ON alerts (user_id, severity)
+    WHERE read = false;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_alert_events_user_created_at
+    ON alert_events (user_id, created_at DESC);
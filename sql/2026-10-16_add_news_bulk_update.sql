@@ -0,0 +1,20 @@
+-- Apply many news column updates (summaries / translations) in one round trip.
+-- p_rows is a JSON array of objects keyed by news.id; columns absent from an
+-- object keep their current value.
+CREATE OR REPLACE FUNCTION bulk_update_news(p_rows JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE news AS n
+        SET summary_400 = COALESCE(x.summary_400, n.summary_400),
+            headline_te = COALESCE(x.headline_te, n.headline_te),
+            matter_te   = COALESCE(x.matter_te,   n.matter_te),
+            headline_hi = COALESCE(x.headline_hi, n.headline_hi),
+            matter_hi   = COALESCE(x.matter_hi,   n.matter_hi)
+        FROM jsonb_populate_recordset(NULL::news, p_rows) AS x
+        WHERE n.id = x.id
+        RETURNING n.id
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
@@ -0,0 +1,13 @@
+-- Unique fingerprint so the RSS ingestor can insert with
+-- ON CONFLICT (fingerprint) DO NOTHING instead of looking up existing
+-- fingerprints first. Duplicate detection happens at index-insert time and
+-- concurrent ingest runs can no longer race each other into duplicates.
+--
+-- The build fails if duplicates already exist; keep the oldest row with:
+--   DELETE FROM news a USING news b
+--   WHERE a.fingerprint = b.fingerprint AND a.ctid > b.ctid;
+--
+-- CONCURRENTLY cannot run inside a transaction block: run the statement
+-- on its own (not wrapped in BEGIN/COMMIT).
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_news_fingerprint
+    ON news (fingerprint);
@@ -0,0 +1,125 @@
+-- Batch-API news jobs no longer block until their batch completes: one cron
+-- run submits a batch and records its id on the claimed rows, and later runs
+-- collect the results once OpenAI reports the batch finished.
+ALTER TABLE news_job_claims
+    ADD COLUMN IF NOT EXISTS batch_id TEXT;
+
+CREATE INDEX IF NOT EXISTS ix_news_job_claims_outstanding_batch
+    ON news_job_claims (job, batch_id)
+    WHERE status = 'claimed' AND batch_id IS NOT NULL;
+
+-- Same as before, except that a (re-)claim clears any batch_id left over from
+-- an earlier run, so a stale batch can no longer settle the new claim.
+CREATE OR REPLACE FUNCTION claim_pending_news(
+    p_job TEXT,
+    p_limit INTEGER,
+    p_lease_seconds INTEGER DEFAULT 900,
+    p_retry_seconds INTEGER DEFAULT 1800,
+    p_max_attempts INTEGER DEFAULT 5
+)
+RETURNS SETOF news
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_column TEXT;
+BEGIN
+    v_column := CASE p_job
+        WHEN 'summary_400' THEN 'summary_400'
+        WHEN 'translate_te' THEN 'headline_te'
+        WHEN 'translate_hi' THEN 'headline_hi'
+    END;
+
+    IF v_column IS NULL THEN
+        RAISE EXCEPTION 'Unknown news job: %', p_job;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        $q$
+        WITH pending AS (
+            SELECT n.id
+            FROM news n
+            WHERE (n.%1$I IS NULL OR n.%1$I = '')
+              AND NOT EXISTS (
+                  SELECT 1 FROM news_job_claims c
+                  WHERE c.job = $1
+                    AND c.news_id = n.id::text
+                    AND (
+                        c.attempts >= $5
+                        OR (c.status = 'claimed'
+                            AND c.claimed_at > now() - make_interval(secs => $3))
+                        OR (c.status = 'failed'
+                            AND c.claimed_at > now() - make_interval(secs => $4 * c.attempts))
+                    )
+              )
+            ORDER BY n.published_at DESC
+            LIMIT $2
+            FOR UPDATE OF n SKIP LOCKED
+        ),
+        claimed AS (
+            INSERT INTO news_job_claims (job, news_id, claimed_at, status, attempts, batch_id)
+            SELECT $1, id::text, now(), 'claimed', 1, NULL FROM pending
+            ON CONFLICT (job, news_id) DO UPDATE SET
+                claimed_at = EXCLUDED.claimed_at,
+                status = 'claimed',
+                attempts = news_job_claims.attempts + 1,
+                batch_id = NULL
+            RETURNING news_id
+        )
+        SELECT n.* FROM news n JOIN claimed c ON c.news_id = n.id::text
+        $q$,
+        v_column
+    )
+    USING p_job, p_limit, p_lease_seconds, p_retry_seconds, p_max_attempts;
+END;
+$$;
+
+-- Record the OpenAI batch that now owns a run's claimed rows.
+CREATE OR REPLACE FUNCTION attach_news_batch(
+    p_job TEXT,
+    p_ids TEXT[],
+    p_batch_id TEXT
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE news_job_claims
+    SET batch_id = p_batch_id
+    WHERE job = p_job
+      AND status = 'claimed'
+      AND news_id = ANY(p_ids);
+$$;
+
+-- Batches submitted for p_job whose rows are still waiting to be settled.
+CREATE OR REPLACE FUNCTION outstanding_news_batches(p_job TEXT)
+RETURNS TABLE (batch_id TEXT, news_ids TEXT[])
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT c.batch_id, array_agg(c.news_id)
+    FROM news_job_claims c
+    WHERE c.job = p_job
+      AND c.status = 'claimed'
+      AND c.batch_id IS NOT NULL
+    GROUP BY c.batch_id;
+$$;
+
+-- p_batch_id restricts settlement to rows still owned by that batch, so a
+-- late collection never overwrites a newer run's claim on the same row.
+DROP FUNCTION IF EXISTS finish_news_claims(TEXT, TEXT[], TEXT[]);
+
+CREATE OR REPLACE FUNCTION finish_news_claims(
+    p_job TEXT,
+    p_done_ids TEXT[],
+    p_failed_ids TEXT[],
+    p_batch_id TEXT DEFAULT NULL
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE news_job_claims
+    SET status = CASE WHEN news_id = ANY(p_done_ids) THEN 'done' ELSE 'failed' END,
+        claimed_at = now()
+    WHERE job = p_job
+      AND news_id = ANY(p_done_ids || p_failed_ids)
+      AND (p_batch_id IS NULL OR batch_id = p_batch_id);
+$$;
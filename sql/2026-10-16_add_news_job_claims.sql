@@ -0,0 +1,61 @@
+-- Claim pending news rows for the summary / translation cron jobs in one
+-- statement. Claimed rows are leased in news_job_claims so overlapping runs
+-- (or a retry shortly after a crash) skip them instead of paying for the
+-- same completion twice; an expired lease makes the row claimable again.
+CREATE TABLE IF NOT EXISTS news_job_claims (
+    job TEXT NOT NULL,
+    news_id TEXT NOT NULL,
+    claimed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (job, news_id)
+);
+
+CREATE OR REPLACE FUNCTION claim_pending_news(
+    p_job TEXT,
+    p_limit INTEGER,
+    p_lease_seconds INTEGER DEFAULT 900
+)
+RETURNS SETOF news
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_column TEXT;
+BEGIN
+    v_column := CASE p_job
+        WHEN 'summary_400' THEN 'summary_400'
+        WHEN 'translate_te' THEN 'headline_te'
+        WHEN 'translate_hi' THEN 'headline_hi'
+    END;
+
+    IF v_column IS NULL THEN
+        RAISE EXCEPTION 'Unknown news job: %', p_job;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        $q$
+        WITH pending AS (
+            SELECT n.id
+            FROM news n
+            WHERE (n.%1$I IS NULL OR n.%1$I = '')
+              AND NOT EXISTS (
+                  SELECT 1 FROM news_job_claims c
+                  WHERE c.job = $1
+                    AND c.news_id = n.id::text
+                    AND c.claimed_at > now() - make_interval(secs => $3)
+              )
+            ORDER BY n.published_at DESC
+            LIMIT $2
+            FOR UPDATE OF n SKIP LOCKED
+        ),
+        claimed AS (
+            INSERT INTO news_job_claims (job, news_id, claimed_at)
+            SELECT $1, id::text, now() FROM pending
+            ON CONFLICT (job, news_id) DO UPDATE SET claimed_at = EXCLUDED.claimed_at
+            RETURNING news_id
+        )
+        SELECT n.* FROM news n JOIN claimed c ON c.news_id = n.id::text
+        $q$,
+        v_column
+    )
+    USING p_job, p_limit, p_lease_seconds;
+END;
+$$;
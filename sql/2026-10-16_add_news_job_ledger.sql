@@ -0,0 +1,89 @@
+-- Turn news_job_claims into a per-job idempotency ledger.
+--   claimed : leased by a running job (lease expires after p_lease_seconds)
+--   done    : result written; the row no longer matches the pending filter
+--   failed  : the model call or parse failed; retried after a linear backoff
+--             (p_retry_seconds * attempts), at most p_max_attempts times
+ALTER TABLE news_job_claims
+    ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'claimed',
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 1;
+
+DROP FUNCTION IF EXISTS claim_pending_news(TEXT, INTEGER, INTEGER);
+
+CREATE OR REPLACE FUNCTION claim_pending_news(
+    p_job TEXT,
+    p_limit INTEGER,
+    p_lease_seconds INTEGER DEFAULT 900,
+    p_retry_seconds INTEGER DEFAULT 1800,
+    p_max_attempts INTEGER DEFAULT 5
+)
+RETURNS SETOF news
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_column TEXT;
+BEGIN
+    v_column := CASE p_job
+        WHEN 'summary_400' THEN 'summary_400'
+        WHEN 'translate_te' THEN 'headline_te'
+        WHEN 'translate_hi' THEN 'headline_hi'
+    END;
+
+    IF v_column IS NULL THEN
+        RAISE EXCEPTION 'Unknown news job: %', p_job;
+    END IF;
+
+    RETURN QUERY EXECUTE format(
+        $q$
+        WITH pending AS (
+            SELECT n.id
+            FROM news n
+            WHERE (n.%1$I IS NULL OR n.%1$I = '')
+              AND NOT EXISTS (
+                  SELECT 1 FROM news_job_claims c
+                  WHERE c.job = $1
+                    AND c.news_id = n.id::text
+                    AND (
+                        c.attempts >= $5
+                        OR (c.status = 'claimed'
+                            AND c.claimed_at > now() - make_interval(secs => $3))
+                        OR (c.status = 'failed'
+                            AND c.claimed_at > now() - make_interval(secs => $4 * c.attempts))
+                    )
+              )
+            ORDER BY n.published_at DESC
+            LIMIT $2
+            FOR UPDATE OF n SKIP LOCKED
+        ),
+        claimed AS (
+            INSERT INTO news_job_claims (job, news_id, claimed_at, status, attempts)
+            SELECT $1, id::text, now(), 'claimed', 1 FROM pending
+            ON CONFLICT (job, news_id) DO UPDATE SET
+                claimed_at = EXCLUDED.claimed_at,
+                status = 'claimed',
+                attempts = news_job_claims.attempts + 1
+            RETURNING news_id
+        )
+        SELECT n.* FROM news n JOIN claimed c ON c.news_id = n.id::text
+        $q$,
+        v_column
+    )
+    USING p_job, p_limit, p_lease_seconds, p_retry_seconds, p_max_attempts;
+END;
+$$;
+
+-- Settle a run's claims in one call: written rows become 'done', the rest
+-- of the claimed rows become 'failed' and wait out their backoff.
+CREATE OR REPLACE FUNCTION finish_news_claims(
+    p_job TEXT,
+    p_done_ids TEXT[],
+    p_failed_ids TEXT[]
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE news_job_claims
+    SET status = CASE WHEN news_id = ANY(p_done_ids) THEN 'done' ELSE 'failed' END,
+        claimed_at = now()
+    WHERE job = p_job
+      AND news_id = ANY(p_done_ids || p_failed_ids);
+$$;
@@ -0,0 +1,18 @@
+-- Partial indexes over the news rows still waiting for a summary or
+-- translation. claim_pending_news filters on exactly these predicates and
+-- orders by published_at DESC, so each cron tick walks a small index of
+-- pending rows instead of scanning the whole news table.
+--
+-- CONCURRENTLY cannot run inside a transaction block: run each statement
+-- on its own (not wrapped in BEGIN/COMMIT).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_pending_summary_400
+    ON news (published_at DESC)
+    WHERE summary_400 IS NULL OR summary_400 = '';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_pending_te
+    ON news (published_at DESC)
+    WHERE headline_te IS NULL OR headline_te = '';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_news_pending_hi
+    ON news (published_at DESC)
+    WHERE headline_hi IS NULL OR headline_hi = '';
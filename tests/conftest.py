@@ -1,11 +1,14 @@
+import hashlib
 import os
 import time
 import uuid
+from contextlib import asynccontextmanager
 from types import SimpleNamespace
 
 import pytest
 from fastapi import Request
 from fastapi.testclient import TestClient
+from redis.exceptions import NoScriptError
 
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
 os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
@@ -14,7 +17,13 @@ os.environ.setdefault("OTP_SECRET_SALT", "test-salt")
 
 from app.main import app
 from app.routes import auth, scan_base
-from app.services import redis_store
+from app.services import redis_store, scan_history
+
+
+@asynccontextmanager
+async def no_lifespan(app):
+    # Skip app startup (scams table create, RSS ingestion) in tests
+    yield
 
 
 class FakePipeline:
@@ -59,6 +68,7 @@ class FakeRedis:
         self.values = {}
         self.expiry = {}
         self.zsets = {}
+        self.scripts = {}
 
     def clear(self):
         self.values.clear()
@@ -90,6 +100,16 @@ class FakeRedis:
             return None
         return self.values.get(key)
 
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._is_expired(key):
+                continue
+            if self.values.pop(key, None) is not None or self.zsets.pop(key, None) is not None:
+                removed += 1
+            self.expiry.pop(key, None)
+        return removed
+
     def exists(self, key):
         if self._is_expired(key):
             return 0
@@ -116,7 +136,14 @@ class FakeRedis:
         self.expiry[key] = time.time() + seconds
         return True
 
+    def evalsha(self, sha, key_count, *args):
+        script = self.scripts.get(sha)
+        if script is None:
+            raise NoScriptError("NOSCRIPT No matching script.")
+        return self.eval(script, key_count, *args)
+
     def eval(self, script, key_count, *args):
+        self.scripts[hashlib.sha1(script.encode("utf-8")).hexdigest()] = script
         if "redis.call('GET', KEYS[1]) == ARGV[1]" in script:
             key, token = args
             if self.get(key) == token:
@@ -149,6 +176,23 @@ def redis_mock(monkeypatch):
     return fake
 
 
+@pytest.fixture(autouse=True)
+def stop_scan_history_writer():
+    # Scan routes start the batched history writer; flush and stop it so the
+    # thread never outlives the test (or logs to closed streams at exit).
+    yield
+    scan_history.stop_scan_history_writer()
+
+
+@pytest.fixture
+def app_without_lifespan():
+    """The app with startup skipped; the real lifespan is restored afterwards."""
+    original = app.router.lifespan_context
+    app.router.lifespan_context = no_lifespan
+    yield app
+    app.router.lifespan_context = original
+
+
 @pytest.fixture
 def token_users():
     return {
@@ -159,7 +203,7 @@ def token_users():
 
 
 @pytest.fixture
-def client(token_users):
+def client(token_users, app_without_lifespan):
     def resolve_user(request: Request):
         header = request.headers.get("Authorization", "")
         token = header.replace("Bearer ", "", 1)
@@ -172,8 +216,6 @@ def client(token_users):
     app.dependency_overrides[scan_base.require_user] = resolve_user
     app.dependency_overrides[auth.get_current_user] = resolve_user
     app.dependency_overrides[auth.get_current_user_optional] = resolve_user
-    app.router.on_startup.clear()
-    app.router.on_shutdown.clear()
 
     with TestClient(app, raise_server_exceptions=False) as test_client:
         yield test_client
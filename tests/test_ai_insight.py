@@ -0,0 +1,36 @@
+import pytest
+from pydantic import ValidationError
+
+from app.routes.ai import InsightRequest, derive_scam_type
+
+
+def test_derive_scam_type_matches_keywords_case_insensitively():
+    assert derive_scam_type("Your COURIER is held") == "Courier Scam"
+    assert derive_scam_type("Crypto doubling scheme") == "Investment Scam"
+    assert derive_scam_type("hello there") == "General Scam"
+
+
+def test_derive_scam_type_keeps_category_priority():
+    # "job" appears first, but banking keywords outrank it
+    assert derive_scam_type("Job offer: share the OTP to confirm") == "Banking / UPI Scam"
+    assert derive_scam_type("Parcel delivery for your job kit") == "Job Scam"
+
+
+def test_derive_scam_type_classifies_long_text_past_cache_limit():
+    text = "x" * 1000 + " courier"
+    assert derive_scam_type(text) == "Courier Scam"
+
+
+def test_derive_scam_type_handles_unicode_case_variants():
+    assert derive_scam_type("my ınvestment plan") == "General Scam"
+    assert derive_scam_type("pay via upİ now") == "Banking / UPI Scam"
+
+
+def test_derive_scam_type_sees_overlapping_keywords():
+    assert derive_scam_type("free jobank transfer") == "Banking / UPI Scam"
+    assert derive_scam_type("cryptotp") == "Banking / UPI Scam"
+
+
+def test_insight_request_rejects_oversized_input():
+    with pytest.raises(ValidationError):
+        InsightRequest(input_text="x" * 2001, analysis_result={})
@@ -1,6 +1,7 @@
 import uuid
 from types import SimpleNamespace
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import text
 
@@ -8,6 +9,9 @@ from app.db import SessionLocal
 from app.main import app
 from app.routes import auth
 
+# Startup (scams table, RSS ingestion) is skipped for these TestClients
+pytestmark = pytest.mark.usefixtures("app_without_lifespan")
+
 
 def _insert_user(db, user_id: str, *, name: str, email: str, phone: str, plan: str = "GO_PRO"):
     db.execute(
@@ -0,0 +1,19 @@
+import time
+
+from app.core.ids import uuid7
+
+
+def test_uuid7_sets_version_and_variant():
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_is_time_ordered():
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+
+    assert first < second
+    assert str(first) < str(second)
@@ -0,0 +1,25 @@
+from app.services import llm_cache
+
+
+def _body(temperature=0.2, prompt="pulse"):
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+    }
+
+
+def test_llm_cache_round_trip():
+    assert llm_cache.get_cached_completion(_body()) is None
+
+    llm_cache.set_cached_completion(_body(), '{"ok": true}', 60)
+
+    assert llm_cache.get_cached_completion(_body()) == '{"ok": true}'
+    assert llm_cache.get_cached_completion(_body(prompt="other")) is None
+
+
+def test_llm_cache_skips_high_temperature():
+    body = _body(temperature=0.9)
+    llm_cache.set_cached_completion(body, "creative", 60)
+
+    assert llm_cache.get_cached_completion(body) is None
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+
+def _source_files():
+    return [path for path in APP_DIR.rglob("*.py") if "__pycache__" not in path.parts]
+
+
+def test_no_misnamed_package_markers():
+    stray = [str(path.relative_to(APP_DIR)) for path in _source_files() if path.name == "_init_.py"]
+
+    assert stray == []
+
+
+def test_no_module_shadowed_by_package():
+    shadowed = [
+        str(path.relative_to(APP_DIR))
+        for path in _source_files()
+        if path.name != "__init__.py" and path.with_suffix("").is_dir()
+    ]
+
+    assert shadowed == []
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 import uuid
 
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -12,6 +13,8 @@ from app.models.user import User
 from app.routes import auth
 import app.routes.qr_secure as qr_secure
 
+pytestmark = pytest.mark.usefixtures("app_without_lifespan")
+
 
 class _FakeUserQuery:
     def __init__(self, user):
@@ -46,8 +49,6 @@ class _FakeDb:
 def _client_with_user(user):
     fake_db = _FakeDb(user)
     app.dependency_overrides[get_db] = lambda: fake_db
-    app.router.on_startup.clear()
-    app.router.on_shutdown.clear()
     return TestClient(app, raise_server_exceptions=False)
 
 
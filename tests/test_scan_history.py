@@ -0,0 +1,190 @@
+import logging
+import queue
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.services import scan_history
+
+
+class _FakeSession:
+    def __init__(self, fail_batch=False, bad_ids=()):
+        self.fail_batch = fail_batch
+        self.bad_ids = set(bad_ids)
+        self.batches = []
+        self.rows = []
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        if isinstance(params, list):
+            if self.fail_batch:
+                raise RuntimeError("batch rejected")
+            self.batches.append(len(params))
+            self.rows.extend(params)
+            return
+        if params["id"] in self.bad_ids:
+            raise RuntimeError("bad row")
+        self.rows.append(params)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+class _CopyCursor:
+    def __init__(self):
+        self.sql = None
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, sql, buf):
+        self.sql = sql
+        self.data = buf.read()
+
+
+class _CopyDb:
+    now = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+    def __init__(self):
+        self.cursor = _CopyCursor()
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar=lambda: self.now)
+
+    def connection(self):
+        raw = SimpleNamespace(cursor=lambda: self.cursor)
+        return SimpleNamespace(connection=SimpleNamespace(driver_connection=raw))
+
+
+def _scan(i):
+    return {
+        "scan_id": f"00000000-0000-0000-0000-{i:012d}",
+        "user_id": "user-1",
+        "input_text": f"text {i}",
+        "risk": "low",
+        "score": 10,
+        "reasons": ["r"],
+        "scan_type": "THREAT",
+        "endpoint": "/scan/threat",
+    }
+
+
+def _queued(i, **overrides):
+    row = {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "user_id": "user-1",
+        "input_text": f"text {i}",
+        "risk": "low",
+        "score": 10,
+        "reasons": '["r"]',
+        "scan_type": "THREAT",
+        "endpoint": "/scan/threat",
+        "request_id": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def _record_invalidations(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(
+        scan_history,
+        "delete_json",
+        lambda namespace, user_id: invalidated.append(user_id),
+    )
+    return invalidated
+
+
+def test_collect_batch_groups_queued_rows_and_drains_on_stop():
+    rows = [_queued(i) for i in range(3)]
+    for row in rows:
+        scan_history._queue.put(row)
+    scan_history._queue.put(scan_history._STOP)
+
+    batch, stopping = scan_history._collect_batch()
+
+    assert batch == rows
+    assert stopping is True
+    assert scan_history._queue.empty()
+
+
+def test_writer_persists_queued_rows_on_stop(monkeypatch):
+    session = _FakeSession()
+    monkeypatch.setattr(scan_history, "SessionLocal", lambda: session)
+    monkeypatch.setattr(scan_history, "_COPY_SUPPORTED", False)
+    invalidated = _record_invalidations(monkeypatch)
+
+    for i in range(3):
+        scan_history.save_scan_history(**_scan(i))
+    scan_history.stop_scan_history_writer()
+
+    assert scan_history._writer is None
+    assert [row["id"] for row in session.rows] == [_scan(i)["scan_id"] for i in range(3)]
+    assert sum(session.batches) == 3
+    assert set(invalidated) == {"user-1"}
+
+
+def test_failed_batch_falls_back_to_row_by_row(monkeypatch, caplog):
+    rows = [_queued(i) for i in range(3)]
+    session = _FakeSession(fail_batch=True, bad_ids={rows[1]["id"]})
+    monkeypatch.setattr(scan_history, "SessionLocal", lambda: session)
+    monkeypatch.setattr(scan_history, "_COPY_SUPPORTED", False)
+    _record_invalidations(monkeypatch)
+
+    with caplog.at_level(logging.WARNING, logger=scan_history.__name__):
+        scan_history._write_batch(rows)
+
+    assert [row["id"] for row in session.rows] == [rows[0]["id"], rows[2]["id"]]
+    assert session.rollbacks == 2
+    assert [r.message for r in caplog.records].count("scan_save_failed") == 1
+
+
+def test_copy_payload_keeps_null_distinct_from_empty_string():
+    db = _CopyDb()
+
+    scan_history._copy_batch(
+        db,
+        [_queued(1, input_text="", score=None, reasons='["say \\"hi\\""]')],
+    )
+
+    assert db.statements == [scan_history.DB_NOW_SQL]
+    assert db.cursor.sql == scan_history.COPY_SCAN_HISTORY_SQL
+    assert db.cursor.data == (
+        '"00000000-0000-0000-0000-000000000001","user-1","","low",,'
+        '"[""say \\""hi\\""""]","THREAT","2026-10-16T12:00:00+00:00"\n'
+    )
+
+
+def test_full_queue_drops_row_and_counts_it(monkeypatch, caplog):
+    monkeypatch.setattr(scan_history, "_queue", queue.Queue(maxsize=1))
+    monkeypatch.setattr(scan_history, "_ensure_writer", lambda: None)
+    dropped_before = scan_history.scan_history_writer_stats()["dropped"]
+
+    with caplog.at_level(logging.WARNING, logger=scan_history.__name__):
+        scan_history.save_scan_history(**_scan(1))
+        scan_history.save_scan_history(**_scan(2))
+
+    stats = scan_history.scan_history_writer_stats()
+    assert stats == {"queued": 1, "dropped": dropped_before + 1}
+    assert scan_history._queue.get_nowait()["id"] == _scan(1)["scan_id"]
+    assert [r.message for r in caplog.records] == ["scan_history_queue_full"]
+
+
+def test_keyword_count_invalidation_tolerates_missing_redis(monkeypatch):
+    def missing_redis(namespace, user_id):
+        raise RuntimeError("REDIS_URL not set")
+
+    monkeypatch.setattr(scan_history, "delete_json", missing_redis)
+
+    assert scan_history.invalidate_keyword_counts("user-1") is False
@@ -0,0 +1,12 @@
+def test_validation_error_with_oversized_integer_input(client):
+    # The 422 body echoes the offending value; it must not exceed what the
+    # response encoder can serialize.
+    response = client.post(
+        "/auth/login",
+        json={"identifier": 100000000000000000000000000000, "password": "x"},
+    )
+
+    assert response.status_code == 422
+    body = response.json()
+    assert body["error_code"] == "VALIDATION_ERROR"
+    assert body["details"][0]["loc"] == ["body", "identifier"]
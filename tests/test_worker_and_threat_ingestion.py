@@ -1,5 +1,6 @@
 from app.services.redis_store import distributed_lock
-from app.services.threat_intel_service import _dedupe_events, _normalize_event
+from app.services import threat_intel_service
+from app.services.threat_intel_service import _dedupe_events, _normalize_event, _resolve_ip
 
 
 
@@ -16,3 +17,24 @@ def test_normalized_threat_events_are_deduplicated():
     deduped = _dedupe_events([event_one, event_two])
     assert len(deduped) == 1
     assert deduped[0].id == event_one.id
+
+
+def test_resolved_ip_coordinates_are_cached_in_redis(redis_mock, monkeypatch):
+    calls = []
+
+    class FakeResponse:
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"loc": "12.5,77.25", "country": "IN"}
+
+    def fake_get(url, timeout):
+        calls.append(url)
+        return FakeResponse()
+
+    monkeypatch.setattr(threat_intel_service.requests, "get", fake_get)
+
+    assert _resolve_ip("8.8.4.4") == (12.5, 77.25)
+    assert _resolve_ip("8.8.4.4") == (12.5, 77.25)
+    assert len(calls) == 1